@@ -3,5 +3,54 @@
 import os
 
 DATA_FILE = "tasks.json"
+JOURNAL_FILE = "tasks.journal"
+# Number of journal records appended before a background compaction folds
+# the journal back into DATA_FILE.
+JOURNAL_COMPACT_THRESHOLD = 500
+# Storage backend: "journal" (tasks.json + change journal) or "sqlite"
+STORAGE_BACKEND = "journal"
+DATABASE_FILE = "tasks.db"
+# Autosave coalesces changes made within this quiet period into one write,
+# but never holds a change longer than the maximum delay.
+AUTOSAVE_DEBOUNCE_MS = 500
+AUTOSAVE_MAX_DELAY_MS = 5000
+# Failed writes of a batch before its records are written one at a time and
+# the first one that still fails is skipped
+AUTOSAVE_MAX_RETRIES = 3
+# How often (ms) the UI checks for changes autosave had to skip
+AUTOSAVE_ERROR_POLL_MS = 1000
+# Load completed tasks as lightweight stubs and read their sessions from disk
+# only when they are expanded or exported.
+LAZY_LOAD_COMPLETED = True
+# Pixels above and below the visible part of the task list whose rows are
+# built ahead of scrolling; rows further away are pooled and reused.
+VIRTUAL_LIST_OVERSCAN_PX = 400
+# Milliseconds a task can stay collapsed before its session table widgets are
+# destroyed (rebuilt on the next expand). None keeps them alive.
+COLLAPSED_TABLE_TEARDOWN_MS = 30000
+# How session tables are drawn: "widgets" (a CTk widget per cell) or "canvas"
+# (one canvas per task, much lighter for tasks with thousands of sessions)
+SESSION_TABLE_RENDERER = "widgets"
+# Progressive startup: in-progress tasks are shown first, then completed tasks
+# are added in batches during idle time, spending at most this many
+# milliseconds per idle turn.
+STARTUP_CHUNK_BUDGET_MS = 8
+STARTUP_BATCH_SIZE = 25
+# How often (ms) the UI checks whether the background load has finished
+LOAD_POLL_MS = 20
+# Split CSV and XLSX exports into parts once a part reaches this many rows or
+# (CSV only) bytes; None for no limit. XLSX sheets are always capped at
+# Excel's row limit. Sharded exports also write a manifest of the parts.
+EXPORT_SHARD_MAX_ROWS = None
+EXPORT_SHARD_MAX_BYTES = None
+# Where XLSX parts go: "sheets" (one workbook) or "files" (one per part)
+XLSX_SHARD_MODE = "sheets"
+# Exporting several formats reads the tasks once and feeds each format's
+# writer through a queue of at most EXPORT_QUEUE_BATCHES batches of
+# EXPORT_BATCH_SIZE rows. XLSX is written in a worker process when
+# EXPORT_XLSX_IN_PROCESS is True.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_QUEUE_BATCHES = 8
+EXPORT_XLSX_IN_PROCESS = True
 CSV_FILE = "task_times.csv"
 DESKTOP_PATH = os.path.join(os.path.expanduser("~"), "Desktop")
@@ -1,5 +1,6 @@
 """Export module for exporting tasks to various formats."""
 
 from .exporter import perform_export
+from .writers import pyarrow_available, zstd_available
 
-__all__ = ["perform_export"]
+__all__ = ["perform_export", "pyarrow_available", "zstd_available"]
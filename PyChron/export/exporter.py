@@ -1,23 +1,184 @@
-"""Export functions for writing tasks to CSV, JSON, and XLSX formats."""
+"""Export functions for writing tasks to CSV, JSON, XLSX and Arrow formats."""
 
-import csv
-import json
 import os
+import time
 from datetime import datetime
+from functools import partial
 
+from constants import (
+    EXPORT_SHARD_MAX_BYTES,
+    EXPORT_SHARD_MAX_ROWS,
+    EXPORT_XLSX_IN_PROCESS,
+    XLSX_SHARD_MODE,
+)
+from utils import format_bytes
 
-def perform_export(tasks, out_dir, name, formats, parent=None):
-    """Write selected formats for completed tasks to the chosen directory.
+from .filters import DEFAULT_STATUSES, select_tasks, time_bound
+from .incremental import load_watermark, save_watermark, scan_changes, watermark_path
+from .pipeline import fan_out
+from .rows import (
+    COLUMNS,
+    SESSION_COLUMNS,
+    TASK_COLUMNS,
+    iter_rows,
+    iter_session_rows,
+    iter_task_rows,
+)
+from .writers import (
+    COMPRESSION_SUFFIXES,
+    write_arrow,
+    write_csv,
+    write_csv_parts,
+    write_json,
+    write_manifest,
+    write_ndjson,
+    write_parquet,
+    write_xlsx_parts,
+)
 
-    Supports csv and json out of the box. Attempts to write xlsx using
-    pandas or openpyxl if available; otherwise notifies the user.
+# Order in which formats are listed in messages
+FORMAT_ORDER = ("csv", "json", "ndjson", "xlsx", "parquet", "arrow")
+# Formats an "append" incremental export adds to in place
+APPENDABLE_FORMATS = ("csv", "ndjson")
+# Writers for the tasks table of a normalized export (XLSX puts it on a sheet)
+TABLE_WRITERS = {
+    "csv": write_csv,
+    "json": write_json,
+    "ndjson": write_ndjson,
+    "parquet": write_parquet,
+    "arrow": write_arrow,
+}
+# Formats that can be compressed while they are written
+COMPRESSIBLE_FORMATS = ("csv", "json", "ndjson")
+# Formats written with pyarrow, which is optional
+ARROW_FORMATS = ("parquet", "arrow")
+
+
+def _manifest_path(base_dir, base_name, fmt):
+    """Path of the manifest written for a sharded export."""
+    return os.path.join(base_dir, f"{base_name}.{fmt}.manifest.json")
+
+
+def _delta_name(base_dir, base_name):
+    """Return a time-stamped delta file name that no existing file uses.
+
+    A second run within the same second gets "-2", "-3", ... appended, so it
+    never overwrites a delta whose sessions the watermark already covers.
+    """
+    name = stamp = f"{base_name}.delta-{datetime.now():%Y%m%d-%H%M%S}"
+    try:
+        existing = os.listdir(base_dir)
+    except OSError:
+        existing = []
+    n = 1
+    while any(entry.startswith(f"{name}.") for entry in existing):
+        n += 1
+        name = f"{stamp}-{n}"
+    return name
+
+
+def _compression_summary(label, raw, stored):
+    """Describe the raw and compressed size of an output."""
+    ratio = raw / stored if stored else 0
+    return f"{label}: {format_bytes(raw)} -> {format_bytes(stored)} ({ratio:.1f}x)"
+
+
+def _describe_error(fmt, path, error):
+    """Return the message shown for a format that failed to export."""
+    if fmt == "xlsx":
+        path = os.path.abspath(path)
+        if isinstance(error, ImportError):
+            return (
+                f"XLSX export failed: openpyxl is not available "
+                f"({error}). "
+                "Install openpyxl to enable xlsx exports."
+            )
+        if isinstance(error, PermissionError):
+            return (
+                f"Permission denied saving XLSX file.\n"
+                f"Path: {path}\n"
+                f"Error: {error}\n\n"
+                "The file may be open in another program."
+            )
+        return (
+            f"Failed to save XLSX file.\n"
+            f"Path: {path}\n"
+            f"Error: {error}\n\n"
+            "Check file permissions and disk space."
+        )
+    if fmt in ARROW_FORMATS and isinstance(error, ImportError):
+        return (
+            f"{fmt.upper()} export failed: pyarrow is not available "
+            f"({error}). "
+            "Install pyarrow to enable parquet and arrow exports."
+        )
+    return f"{fmt.upper()} export failed: {error}"
+
+
+def perform_export(
+    tasks,
+    out_dir,
+    name,
+    formats,
+    parent=None,
+    incremental=None,
+    layout="denormalized",
+    compression=None,
+    start=None,
+    end=None,
+    statuses=DEFAULT_STATUSES,
+    match=None,
+):
+    """Write selected formats for the chosen tasks to the chosen directory.
+
+    Supports csv, json and ndjson out of the box, streaming rows to disk.
+    Writes xlsx with openpyxl, and parquet and arrow (Arrow IPC file) with
+    typed columns using pyarrow, if they are installed; otherwise notifies
+    the user. The tasks are read once and all selected formats are written
+    concurrently; failures are reported together. CSV and XLSX output is
+    split into parts according to the EXPORT_SHARD_* and XLSX_SHARD_MODE
+    settings, with a manifest listing the parts whenever there is more
+    than one.
+
+    Incremental exports keep a watermark next to the output and write only
+    the sessions that are new or changed since the last incremental export:
+    "delta" writes them to new time-stamped files, "append" adds them to the
+    existing CSV and NDJSON files (JSON and XLSX get delta files, as they
+    cannot be appended to in place).
+
+    The default layout writes one row per session, repeating its task's
+    name and note. The "normalized" layout writes a tasks table (one row
+    per task) and a sessions table that refers to tasks by ID: separate
+    .tasks and .sessions files, or Tasks and Sessions sheets in XLSX.
+
+    With compression ("gzip" or "zstd"), csv, json and ndjson files are
+    compressed as they are written (.gz/.zst) and the success message
+    reports the raw and compressed sizes and the throughput.
+
+    By default every session of every completed task is exported. start and
+    end limit the export to sessions starting in [start, end), statuses
+    picks which tasks are included and match keeps only tasks whose name or
+    note contains it (or, with *, ? or [, matches it as a wildcard
+    pattern). Tasks are filtered before anything is read and the range is
+    looked up by start time, so sessions outside it are never formatted.
+    A filtered incremental export only updates the watermark for the
+    sessions it covered.
 
     Args:
         tasks: Dictionary of Task objects
         out_dir: Output directory path
         name: Base filename (without extension)
-        formats: List of format strings ("csv", "json", "xlsx")
+        formats: List of format strings ("csv", "json", "ndjson", "xlsx",
+            "parquet", "arrow")
         parent: Parent window for dialogs (optional, for themed dialogs)
+        incremental: None for a full export, or "delta" or "append"
+        layout: "denormalized" or "normalized"
+        compression: None, "gzip" or "zstd"
+        start: Earliest session start to export (datetime, or date for
+            midnight), or None
+        end: Exclusive latest session start (datetime or date), or None
+        statuses: Task statuses to export
+        match: Task name/note filter, or None
     """
     # Import here to avoid circular dependencies
     if parent:
@@ -25,12 +186,24 @@ def perform_export(tasks, out_dir, name, formats, parent=None):
     else:
         from tkinter import messagebox
 
-    completed_tasks = [t for t in tasks.values() if t.status == "Completed"]
-    if not completed_tasks:
+    start_us = time_bound(start)
+    end_us = time_bound(end)
+    filtered = (
+        start_us is not None
+        or end_us is not None
+        or bool(match)
+        or tuple(statuses) != DEFAULT_STATUSES
+    )
+    selected_tasks = select_tasks(tasks.values(), statuses, match)
+    if not selected_tasks:
+        if filtered:
+            msg = "No tasks match the export filters."
+        else:
+            msg = "No completed tasks to export."
         if parent:
-            show_info(parent, "Export", "No completed tasks to export.")
+            show_info(parent, "Export", msg)
         else:
-            messagebox.showinfo("Export", "No completed tasks to export.")
+            messagebox.showinfo("Export", msg)
         return
 
     # Determine whether the user entered a full path in the name box.
@@ -52,277 +225,218 @@ def perform_export(tasks, out_dir, name, formats, parent=None):
             messagebox.showerror("Export", f"Output directory unavailable: {e}")
         return
 
-    rows = []
-    for task in completed_tasks:
-        # Get task note - use direct attribute access
-        # Debug: Check if note attribute exists and its value
-        task_note = task.note if hasattr(task, "note") and task.note else ""
-        for i, entry in enumerate(task.timings):
-            start_str = entry.get("start")
-            end_str = entry.get("end")
-            start = (
-                datetime.fromisoformat(start_str) if start_str else None
-            )
-            end = datetime.fromisoformat(end_str) if end_str else None
-            duration = (
-                int((end - start).total_seconds()) if start and end else ""
-            )
-            # Use custom session name if available, otherwise default
-            session_name = (
-                entry.get("name") if entry.get("name") else f"Session {i + 1}"
-            )
-            # Get session note - handle both key and None cases
-            session_note = entry.get("note") if entry.get("note") else ""
-            start_time_str = (
-                start.strftime("%Y-%m-%d %H:%M:%S") if start else ""
-            )
-            end_time_str = (
-                end.strftime("%Y-%m-%d %H:%M:%S") if end else ""
-            )
-            rows.append(
-                {
-                    "Task Name": task.name,
-                    "Session": session_name,
-                    "Start Time": start_time_str,
-                    "End Time": end_time_str,
-                    "Duration (seconds)": duration,
-                    "Session Note": session_note,
-                    "Task Note": task_note,
-                }
-            )
-
-    # CSV
-    if "csv" in formats:
-        csv_path = os.path.join(base_dir, f"{base_name}.csv")
-        try:
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(
-                    [
-                        "Task Name",
-                        "Session",
-                        "Start Time",
-                        "End Time",
-                        "Duration (seconds)",
-                        "Session Note",
-                        "Task Note",
-                    ]
-                )
-                for r in rows:
-                    writer.writerow(
-                        [
-                            r["Task Name"],
-                            r["Session"],
-                            r["Start Time"],
-                            r["End Time"],
-                            r["Duration (seconds)"],
-                            r["Session Note"],
-                            r["Task Note"],
-                        ]
-                    )
-        except Exception as e:
+    # Incremental exports only write sessions that changed since the watermark
+    keep = None
+    export_tasks = selected_tasks
+    names = {fmt: base_name for fmt in formats}
+    append = incremental == "append"
+    if incremental:
+        wm_path = watermark_path(base_dir, base_name)
+        changed, sessions = scan_changes(
+            selected_tasks, load_watermark(wm_path), start_us, end_us, merge=filtered
+        )
+        if not changed:
+            try:
+                # Still record sessions that were removed since last time
+                save_watermark(wm_path, sessions)
+            except Exception:
+                pass
+            msg = "No new or changed sessions since the last export."
             if parent:
-                show_error(parent, "Export", f"CSV export failed: {e}")
+                show_info(parent, "Export", msg)
             else:
-                messagebox.showerror("Export", f"CSV export failed: {e}")
-            # Don't return - continue with other formats
+                messagebox.showinfo("Export", msg)
+            return
+        export_tasks = [t for t in selected_tasks if t.name in changed]
 
-    # JSON
-    if "json" in formats:
-        json_path = os.path.join(base_dir, f"{base_name}.json")
-        try:
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(rows, f, indent=2)
-        except Exception as e:
-            if parent:
-                show_error(parent, "Export", f"JSON export failed: {e}")
-            else:
-                messagebox.showerror("Export", f"JSON export failed: {e}")
-            # Don't return - continue with other formats
+        def keep(task, index, session):
+            return index in changed[task.name]
 
-    # XLSX - try pandas then openpyxl
-    if "xlsx" in formats:
-        xlsx_path = os.path.join(base_dir, f"{base_name}.xlsx")
-        wrote_xlsx = False
+        delta_name = _delta_name(base_dir, base_name)
+        for fmt in formats:
+            if not (append and fmt in APPENDABLE_FORMATS):
+                names[fmt] = delta_name
 
-        # Try pandas first (requires openpyxl as dependency)
-        try:
-            import pandas as pd
+    # Compressed formats get the compression's suffix after their extension
+    suffixes = {
+        fmt: COMPRESSION_SUFFIXES[compression]
+        if compression and fmt in COMPRESSIBLE_FORMATS
+        else ""
+        for fmt in formats
+    }
 
-            # Check if openpyxl is available for pandas
-            try:
-                import importlib.util
-
-                if importlib.util.find_spec("openpyxl") is None:
-                    raise ImportError("pandas requires openpyxl for Excel export")
-            except ImportError:
-                raise ImportError("pandas requires openpyxl for Excel export")
-
-            df = pd.DataFrame(rows)
-            xlsx_path_abs = os.path.abspath(xlsx_path)
-            df.to_excel(xlsx_path_abs, index=False, engine="openpyxl")
-            if os.path.exists(xlsx_path_abs):
-                wrote_xlsx = True
-            else:
-                raise Exception("File was not created after pandas save")
-        except ImportError:
-            # pandas or openpyxl not available, try openpyxl directly
-            pass
-        except Exception:
-            # pandas failed for another reason, try openpyxl directly
-            pass
-
-        # Fallback to openpyxl directly
-        if not wrote_xlsx:
-            try:
-                from openpyxl import Workbook
-
-                wb = Workbook()
-                ws = wb.active
-                # Write header row
-                header = [
-                    "Task Name",
-                    "Session",
-                    "Start Time",
-                    "End Time",
-                    "Duration (seconds)",
-                    "Session Note",
-                    "Task Note",
-                ]
-                ws.append(header)
-
-                # Write data rows - ensure all values are strings or numbers
-                for r in rows:
-                    duration_val = r.get("Duration (seconds)", 0)
-                    duration_num = (
-                        duration_val
-                        if isinstance(duration_val, (int, float))
-                        else 0
-                    )
-                    row_data = [
-                        str(r.get("Task Name", "")),
-                        str(r.get("Session", "")),
-                        str(r.get("Start Time", "")),
-                        str(r.get("End Time", "")),
-                        duration_num,
-                        str(r.get("Session Note", "")),
-                        str(r.get("Task Note", "")),
-                    ]
-                    ws.append(row_data)
-
-                # Save the workbook - use absolute path
-                xlsx_path_abs = os.path.abspath(xlsx_path)
+    def _compression(fmt):
+        return compression if fmt in COMPRESSIBLE_FORMATS else None
+
+    errors = {}
+    columns = COLUMNS
+    rows = iter_rows(export_tasks, keep, start_us, end_us)
+    extra_sheets = ()
+    if layout == "normalized":
+        columns = SESSION_COLUMNS
+        rows = iter_session_rows(export_tasks, keep, start_us, end_us)
+        # The tasks table is small, so it is always written in full
+        task_rows = list(iter_task_rows(selected_tasks))
+        extra_sheets = (("Tasks", TASK_COLUMNS, task_rows),)
+        for fmt in formats:
+            if fmt in TABLE_WRITERS:
+                table_path = os.path.join(base_dir, f"{names[fmt]}.tasks.{fmt}{suffixes[fmt]}")
+                options = {"columns": TASK_COLUMNS}
+                if _compression(fmt):
+                    options["compression"] = compression
                 try:
-                    wb.save(xlsx_path_abs)
-                except PermissionError as perm_err:
-                    error_msg = (
-                        f"Permission denied saving XLSX file.\n"
-                        f"Path: {xlsx_path_abs}\n"
-                        f"Error: {str(perm_err)}\n\n"
-                        "The file may be open in another program."
-                    )
-                    if parent:
-                        show_error(parent, "Export", error_msg)
-                    else:
-                        messagebox.showerror("Export", error_msg)
-                    return
-                except Exception as save_error:
-                    error_msg = (
-                        f"Failed to save XLSX file.\n"
-                        f"Path: {xlsx_path_abs}\n"
-                        f"Error: {str(save_error)}\n\n"
-                        "Check file permissions and disk space."
-                    )
-                    if parent:
-                        show_error(parent, "Export", error_msg)
-                    else:
-                        messagebox.showerror("Export", error_msg)
-                    return
-
-                # Verify file was created (check both paths)
-                if not os.path.exists(xlsx_path_abs) and not os.path.exists(
-                    xlsx_path
-                ):
-                    dir_exists = os.path.exists(base_dir)
-                    dir_writable = (
-                        os.access(base_dir, os.W_OK)
-                        if dir_exists
-                        else "N/A"
-                    )
-                    error_msg = (
-                        f"XLSX file was not created.\n"
-                        f"Expected path: {xlsx_path_abs}\n"
-                        f"Directory exists: {dir_exists}\n"
-                        f"Directory writable: {dir_writable}\n\n"
-                        "Check file permissions and disk space."
-                    )
-                    if parent:
-                        show_error(parent, "Export", error_msg)
-                    else:
-                        messagebox.showerror("Export", error_msg)
-                    return
-
-                wrote_xlsx = True
-            except ImportError as import_err:
-                msg = (
-                    f"XLSX export failed: openpyxl is not available "
-                    f"({str(import_err)}). "
-                    "Install openpyxl to enable xlsx exports."
-                )
-                if parent:
-                    show_error(parent, "Export", msg)
-                else:
-                    messagebox.showerror("Export", msg)
-            except Exception as e:
-                import traceback
-
-                error_details = traceback.format_exc()
-                msg = (
-                    f"XLSX export failed: {str(e)}\n\n"
-                    f"Details: {error_details}\n\n"
-                    "Make sure openpyxl is installed and "
-                    "the output directory is writable."
-                )
-                if parent:
-                    show_error(parent, "Export", msg)
-                else:
-                    messagebox.showerror("Export", msg)
-                # Don't return - continue to show success for other formats
-
-        # Report XLSX status - if we requested XLSX but didn't write it
-        if "xlsx" in formats and not wrote_xlsx:
-            # Error already shown above, but continue to show success for other formats
-            pass
-
-    # Show success message - include info about which formats succeeded
-    formats_succeeded = []
+                    TABLE_WRITERS[fmt](table_path, task_rows, **options)
+                except Exception as e:
+                    errors[fmt] = e
+                names[fmt] = f"{names[fmt]}.sessions"
+
+    paths = {fmt: os.path.join(base_dir, f"{names[fmt]}.{fmt}{suffixes[fmt]}") for fmt in formats}
+    # Raw and stored sizes reported by the JSON writers
+    sizes = {"json": {}, "ndjson": {}}
+    jobs = {}
     if "csv" in formats:
-        csv_file = os.path.join(base_dir, f"{base_name}.csv")
-        if os.path.exists(csv_file):
-            formats_succeeded.append("CSV")
+        jobs["csv"] = (
+            partial(
+                write_csv_parts,
+                paths["csv"],
+                max_rows=EXPORT_SHARD_MAX_ROWS,
+                max_bytes=EXPORT_SHARD_MAX_BYTES,
+                append=append,
+                columns=columns,
+                compression=_compression("csv"),
+            ),
+            False,
+        )
+    # JSON (streamed array) and NDJSON (one object per line)
     if "json" in formats:
-        json_file = os.path.join(base_dir, f"{base_name}.json")
-        if os.path.exists(json_file):
-            formats_succeeded.append("JSON")
+        jobs["json"] = (
+            partial(
+                write_json,
+                paths["json"],
+                columns=columns,
+                compression=_compression("json"),
+                sizes=sizes["json"],
+            ),
+            False,
+        )
+    if "ndjson" in formats:
+        jobs["ndjson"] = (
+            partial(
+                write_ndjson,
+                paths["ndjson"],
+                append=append,
+                columns=columns,
+                compression=_compression("ndjson"),
+                sizes=sizes["ndjson"],
+            ),
+            False,
+        )
+    # XLSX - streamed with openpyxl's write-only mode; serialising the sheet
+    # XML is CPU-bound, so it runs in a worker process
     if "xlsx" in formats:
-        xlsx_file = os.path.join(base_dir, f"{base_name}.xlsx")
-        if os.path.exists(xlsx_file):
-            formats_succeeded.append("XLSX")
+        jobs["xlsx"] = (
+            partial(
+                write_xlsx_parts,
+                os.path.abspath(paths["xlsx"]),
+                max_rows=EXPORT_SHARD_MAX_ROWS,
+                mode=XLSX_SHARD_MODE,
+                columns=columns,
+                extra_sheets=extra_sheets,
+            ),
+            EXPORT_XLSX_IN_PROCESS,
+        )
+    # Parquet and Arrow IPC, written in record batches with typed columns
+    for fmt, writer in (("parquet", write_parquet), ("arrow", write_arrow)):
+        if fmt in formats:
+            jobs[fmt] = (partial(writer, paths[fmt], columns=columns), False)
+    for fmt in errors:
+        jobs.pop(fmt, None)  # Its tasks table already failed
+
+    # Read the tasks once and write every format at the same time
+    started = time.perf_counter()
+    results, job_errors = fan_out(rows, jobs)
+    elapsed = time.perf_counter() - started
+    errors.update(job_errors)
+
+    error_msgs = []
+    read_error = errors.pop(None, None)
+    if read_error is not None:
+        error_msgs.append(f"Reading tasks failed: {read_error}")
+    formats_succeeded = []
+    compressed = {}  # Format -> raw and stored sizes
+    for fmt in FORMAT_ORDER:
+        if fmt in errors:
+            error_msgs.append(_describe_error(fmt, paths[fmt], errors[fmt]))
+        elif fmt in results:
+            label = fmt.upper()
+            if fmt in ("csv", "xlsx"):
+                parts = results[fmt]
+                if len(parts) > 1:
+                    label = f"{label} ({len(parts)} parts)"
+                    try:
+                        write_manifest(
+                            _manifest_path(base_dir, names[fmt], fmt),
+                            fmt,
+                            parts,
+                            columns=columns,
+                        )
+                    except Exception as e:
+                        error_msgs.append(f"{fmt.upper()} manifest failed: {e}")
+                sizes[fmt] = {
+                    "bytes": sum(part.get("bytes", 0) for part in parts),
+                    "stored_bytes": sum(part.get("stored_bytes", 0) for part in parts),
+                }
+            formats_succeeded.append(label)
+            if _compression(fmt) and sizes[fmt]:
+                compressed[fmt] = sizes[fmt]
+
+    if incremental:
+        if errors or read_error is not None:
+            # Keep the old watermark so the next run exports these again
+            error_msgs.append(
+                "The export watermark was not updated; the next incremental "
+                "export will include these sessions again."
+            )
+        else:
+            try:
+                save_watermark(wm_path, sessions)
+            except Exception as e:
+                error_msgs.append(f"Saving the export watermark failed: {e}")
+
+    if error_msgs:
+        error_msg = "\n\n".join(error_msgs)
+        if parent:
+            show_error(parent, "Export", error_msg)
+        else:
+            messagebox.showerror("Export", error_msg)
 
     if formats_succeeded:
         formats_str = ", ".join(formats_succeeded)
-        success_msg = (
-            f"Export completed to: {base_dir}\nFormats: {formats_str}"
-        )
+        success_msg = f"Export completed to: {base_dir}\nFormats: {formats_str}"
+        if incremental:
+            count = sum(len(indexes) for indexes in changed.values())
+            success_msg += f"\nNew or changed sessions: {count}"
+        if compressed:
+            lines = [
+                _compression_summary(fmt.upper(), size["bytes"], size["stored_bytes"])
+                for fmt, size in compressed.items()
+            ]
+            # Formats are written concurrently, so throughput is for all of them
+            raw = sum(size["bytes"] for size in compressed.values())
+            stored = sum(size["stored_bytes"] for size in compressed.values())
+            throughput = raw / elapsed if elapsed > 0 else 0
+            lines.append(
+                f"{_compression_summary(compression, raw, stored)} "
+                f"in {elapsed:.1f}s, {format_bytes(throughput)}/s"
+            )
+            success_msg += "\n" + "\n".join(lines)
         if parent:
             show_info(parent, "Export", success_msg)
         else:
             messagebox.showinfo("Export", success_msg)
     else:
         # No formats succeeded
-        error_msg = (
-            "All export formats failed. Check error messages above."
-        )
+        error_msg = "All export formats failed. Check error messages above."
         if parent:
             show_error(parent, "Export", error_msg)
         else:
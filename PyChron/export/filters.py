@@ -0,0 +1,61 @@
+"""Export filters applied before any rows are built."""
+
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+
+from models.session import to_epoch_us
+
+# Statuses exported when no status filter is given
+DEFAULT_STATUSES = ("Completed",)
+
+
+def time_bound(value):
+    """Convert a datetime or date (midnight) bound to epoch microseconds.
+
+    Returns None for None, meaning the range is open on that side.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime) and isinstance(value, date):
+        value = datetime(value.year, value.month, value.day)
+    return to_epoch_us(value)
+
+
+def task_matcher(pattern):
+    """Return a function telling whether a task's name or note matches.
+
+    Matching ignores case. A pattern with *, ? or [ is a wildcard pattern
+    matched against the whole name or note (e.g. "client a*" for a name
+    prefix); any other pattern matches as a substring.
+
+    Returns:
+        Function (task) -> bool, or None for an empty pattern
+    """
+    pattern = (pattern or "").strip().lower()
+    if not pattern:
+        return None
+    if any(char in pattern for char in "*?["):
+
+        def _matches(text):
+            return fnmatchcase(text.lower(), pattern)
+
+    else:
+
+        def _matches(text):
+            return pattern in text.lower()
+
+    return lambda task: _matches(task.name) or _matches(task.note or "")
+
+
+def select_tasks(tasks, statuses=DEFAULT_STATUSES, match=None):
+    """Return the tasks with one of the statuses whose name or note match.
+
+    Args:
+        tasks: Iterable of Task objects
+        statuses: Task statuses to include
+        match: Name/note pattern (see task_matcher), or None
+    """
+    matcher = task_matcher(match)
+    return [
+        task for task in tasks if task.status in statuses and (matcher is None or matcher(task))
+    ]
@@ -0,0 +1,99 @@
+"""Watermark manifest for incremental exports.
+
+The watermark records when an export last ran and a content hash for every
+session it covered, keyed by task name and session start time. The next
+incremental export compares against it and writes only the sessions that
+are new or whose content changed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+WATERMARK_VERSION = 1
+
+
+def watermark_path(base_dir, base_name):
+    """Path of the watermark kept next to an export."""
+    return os.path.join(base_dir, f"{base_name}.watermark.json")
+
+
+def load_watermark(path):
+    """Return the saved watermark, or None if there is no usable one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != WATERMARK_VERSION:
+        return None
+    return data
+
+
+def save_watermark(path, sessions):
+    """Write the watermark for the sessions covered by an export.
+
+    Args:
+        path: Path of the watermark file
+        sessions: Dictionary of task name -> {start key: content hash}
+    """
+    data = {
+        "version": WATERMARK_VERSION,
+        "last_export": datetime.now().isoformat(timespec="seconds"),
+        "sessions": sessions,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def session_hash(task, index, session):
+    """Hash the exported content of a session (everything but its key)."""
+    content = "\x1f".join(
+        (
+            str(session.end_us),
+            session.display_name(index),
+            session.note or "",
+            task.note or "",
+        )
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def scan_changes(tasks, watermark, start_us=None, end_us=None, merge=False):
+    """Find the sessions that are new or changed since the watermark.
+
+    Only hashes are computed here; no rows are built or formatted.
+
+    Args:
+        tasks: Iterable of Task objects being exported
+        watermark: Loaded watermark, or None to treat every session as new
+        start_us: Only consider sessions starting at or after this time
+        end_us: Only consider sessions starting before this time
+        merge: Keep the watermark's entries for sessions that were not
+            scanned (for filtered exports) instead of replacing them
+
+    Returns:
+        Tuple (changed, sessions): changed maps task name to the set of
+        indexes of its new or changed sessions (tasks without changes are
+        left out), sessions is the state to save as the next watermark
+    """
+    previous = watermark["sessions"] if watermark else {}
+    changed = {}
+    sessions = {name: dict(hashes) for name, hashes in previous.items()} if merge else {}
+    ranged = start_us is not None or end_us is not None
+    for task in tasks:
+        seen = previous.get(task.name, {})
+        hashes = sessions.setdefault(task.name, {})
+        if ranged:
+            pairs = task.iter_sessions_between(start_us, end_us)
+        else:
+            pairs = enumerate(task.iter_sessions())
+        for i, session in pairs:
+            key = str(session.start_us)
+            digest = hashes[key] = session_hash(task, i, session)
+            if seen.get(key) != digest:
+                changed.setdefault(task.name, set()).add(i)
+    return changed, sessions
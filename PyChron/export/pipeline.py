@@ -0,0 +1,140 @@
+"""Fan-out pipeline that feeds several export writers from one pass over rows.
+
+A single producer reads the rows once and hands them, in batches, to a
+bounded queue per writer. Writers run concurrently: threads for the light
+text formats and a worker process for writers marked CPU-bound (XLSX),
+which would otherwise hold the GIL. A writer that fails keeps draining its
+queue, so the producer and the other writers are never blocked by it.
+"""
+
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from constants import EXPORT_BATCH_SIZE, EXPORT_QUEUE_BATCHES
+
+# How long the producer waits on a full queue before checking its writer
+PUT_RETRY_SECONDS = 0.5
+
+
+def _run_job(writer, batches):
+    """Run writer over the rows arriving on the batches queue.
+
+    Runs in a worker thread or process. Whether the writer returns or
+    raises, the queue is drained up to the end marker afterwards.
+    """
+    finished = False
+
+    def _rows():
+        nonlocal finished
+        while True:
+            batch = batches.get()
+            if batch is None:
+                finished = True
+                return
+            yield from batch
+
+    try:
+        return writer(_rows())
+    finally:
+        if not finished:
+            while batches.get() is not None:
+                pass
+
+
+def _put(queues, futures, item):
+    """Put item on every queue, dropping queues whose writer has stopped.
+
+    A writer drains its queue even after failing, but a worker process that
+    died cannot, so a full queue is given up once its future is done.
+    """
+    for name, q in list(queues.items()):
+        while True:
+            try:
+                q.put(item, timeout=PUT_RETRY_SECONDS)
+                break
+            except queue.Full:
+                if futures[name].done():
+                    del queues[name]
+                    break
+
+
+def fan_out(rows, jobs, batch_size=EXPORT_BATCH_SIZE, queue_batches=EXPORT_QUEUE_BATCHES):
+    """Run several writers over a single pass of rows.
+
+    Args:
+        rows: Iterable of rows, consumed once
+        jobs: Dictionary of name -> (writer, in_process). writer is called
+            with an iterable of the rows and its return value is collected;
+            it must be picklable (e.g. a functools.partial of a module-level
+            function) when in_process is True
+        batch_size: Rows handed to the writers at a time
+        queue_batches: Batches each writer's queue holds before the
+            producer waits for it
+
+    Returns:
+        Tuple (results, errors) of dictionaries keyed by job name holding
+        each writer's return value or the exception it raised. An error
+        while reading rows is reported under the key None.
+    """
+    results = {}
+    errors = {}
+    if not jobs:
+        return results, errors
+
+    thread_jobs = {name: job for name, job in jobs.items() if not job[1]}
+    process_jobs = {name: job for name, job in jobs.items() if job[1]}
+
+    manager = process_pool = None
+    if process_jobs:
+        try:
+            manager = multiprocessing.Manager()
+            process_pool = ProcessPoolExecutor(max_workers=len(process_jobs))
+        except Exception:
+            # No worker processes available here; run them on threads
+            if manager is not None:
+                manager.shutdown()
+            manager = None
+            thread_jobs.update(process_jobs)
+            process_jobs = {}
+
+    queues = {}
+    futures = {}
+    thread_pool = ThreadPoolExecutor(
+        max_workers=max(len(thread_jobs), 1), thread_name_prefix="pychron-export"
+    )
+    try:
+        for name, (writer, _) in process_jobs.items():
+            queues[name] = manager.Queue(maxsize=queue_batches)
+            futures[name] = process_pool.submit(_run_job, writer, queues[name])
+        for name, (writer, _) in thread_jobs.items():
+            queues[name] = queue.Queue(maxsize=queue_batches)
+            futures[name] = thread_pool.submit(_run_job, writer, queues[name])
+
+        live = dict(queues)
+        try:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    _put(live, futures, batch)
+                    batch = []
+            if batch:
+                _put(live, futures, batch)
+        except Exception as e:
+            errors[None] = e
+        finally:
+            _put(live, futures, None)
+
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    finally:
+        thread_pool.shutdown()
+        if process_pool is not None:
+            process_pool.shutdown()
+        if manager is not None:
+            manager.shutdown()
+    return results, errors
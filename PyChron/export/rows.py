@@ -0,0 +1,139 @@
+"""Row generation shared by the export writers."""
+
+import hashlib
+
+# Column headers, in output order (denormalized layout: one row per session
+# carrying its task's name and note)
+COLUMNS = (
+    "Task Name",
+    "Session",
+    "Start Time",
+    "End Time",
+    "Duration (seconds)",
+    "Session Note",
+    "Task Note",
+)
+# Normalized layout: one row per task, and sessions referring to it by ID
+TASK_COLUMNS = (
+    "Task ID",
+    "Task Name",
+    "Status",
+    "Task Note",
+    "Total Duration (seconds)",
+    "Sessions",
+)
+SESSION_COLUMNS = (
+    "Task ID",
+    "Session",
+    "Start Time",
+    "End Time",
+    "Duration (seconds)",
+    "Session Note",
+)
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def time_columns(columns):
+    """Return the indexes of the datetime columns among columns."""
+    return tuple(i for i, name in enumerate(columns) if name in ("Start Time", "End Time"))
+
+
+TIME_COLUMNS = time_columns(COLUMNS)
+
+
+def task_id(task):
+    """Return a short ID derived from the task name.
+
+    Task names are unique, so the ID is stable across exports, and
+    sessions written by incremental exports still match the tasks table.
+    """
+    return hashlib.blake2b(task.name.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _sessions(task, start_us, end_us):
+    """Yield (index, session) pairs, limited to a start-time range if given."""
+    if start_us is None and end_us is None:
+        return enumerate(task.iter_sessions())
+    return task.iter_sessions_between(start_us, end_us)
+
+
+def iter_rows(tasks, keep=None, start_us=None, end_us=None):
+    """Yield one row tuple per session of the given tasks, in COLUMNS order.
+
+    Rows are produced lazily so writers can stream them to disk. Start and
+    end times are datetimes and the duration is whole seconds; use
+    format_row for text formats.
+
+    Args:
+        tasks: Iterable of Task objects
+        keep: Optional function (task, index, session) returning whether a
+            session is exported; it runs before the row is built
+        start_us: Only export sessions starting at or after this time
+            (epoch microseconds); looked up in the task's start-time index
+        end_us: Only export sessions starting before this time
+    """
+    for task in tasks:
+        task_note = task.note or ""
+        for i, session in _sessions(task, start_us, end_us):
+            if keep is not None and not keep(task, i, session):
+                continue
+            yield (
+                task.name,
+                # Use custom session name if available, otherwise default
+                session.display_name(i),
+                session.start,
+                session.end,
+                session.seconds,
+                session.note or "",
+                task_note,
+            )
+
+
+def iter_task_rows(tasks):
+    """Yield one row per task in TASK_COLUMNS order.
+
+    Uses the cached totals, so stub tasks are not loaded.
+    """
+    for task in tasks:
+        yield (
+            task_id(task),
+            task.name,
+            task.status,
+            task.note or "",
+            int(task.get_total_duration().total_seconds()),
+            task.session_count,
+        )
+
+
+def iter_session_rows(tasks, keep=None, start_us=None, end_us=None):
+    """Yield one row per session in SESSION_COLUMNS order.
+
+    Like iter_rows, but sessions refer to their task by ID instead of
+    repeating its name and note.
+    """
+    for task in tasks:
+        tid = task_id(task)
+        for i, session in _sessions(task, start_us, end_us):
+            if keep is not None and not keep(task, i, session):
+                continue
+            yield (
+                tid,
+                session.display_name(i),
+                session.start,
+                session.end,
+                session.seconds,
+                session.note or "",
+            )
+
+
+def format_row(row, times=TIME_COLUMNS):
+    """Return a row with its datetime columns formatted as text.
+
+    Args:
+        row: Row tuple
+        times: Indexes of the datetime columns (see time_columns)
+    """
+    row = list(row)
+    for i in times:
+        row[i] = row[i].strftime(TIME_FORMAT)
+    return row
@@ -0,0 +1,453 @@
+"""Streaming writers for the export formats.
+
+Each writer consumes an iterable of rows from rows.iter_rows (or, with the
+matching columns, the normalized row generators) and writes them as it
+goes, so memory use does not grow with the number of rows.
+Writers return the number of data rows written, except the *_parts writers,
+which split their output into shards and return a list of the parts.
+
+The text writers (CSV, JSON, NDJSON) can compress on the fly with gzip or,
+if the zstandard package is installed, zstd.
+"""
+
+import csv
+import gzip
+import json
+import os
+
+from .rows import COLUMNS, format_row, time_columns
+
+# File name suffix added for each compression
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+# gzip level used for exports; zlib's default trades a little size for a lot
+# of speed over GzipFile's default of 9
+GZIP_LEVEL = 6
+# Text is encoded and handed to the compressor in chunks of about this size
+_WRITE_CHUNK_CHARS = 1 << 16
+
+
+def zstd_available():
+    """Return True if the zstandard package can be imported."""
+    from importlib.util import find_spec
+
+    return find_spec("zstandard") is not None
+
+
+class _OutputFile:
+    """Text output file, optionally compressed, that tracks its sizes.
+
+    bytes counts the uncompressed UTF-8 bytes (including the existing file
+    size when appending); stored_bytes is the size on disk once closed.
+    Appending to a compressed file adds a new gzip member or zstd frame,
+    which decompressors read as one stream.
+    """
+
+    def __init__(self, path, append=False, compression=None, newline=""):
+        self._raw = open(path, "ab" if append else "wb")  # noqa: SIM115
+        self.bytes = self._raw.tell()
+        self.stored_bytes = self.bytes
+        if compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=GZIP_LEVEL)
+        elif compression == "zstd":
+            import zstandard
+
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        elif compression is None:
+            self._stream = self._raw
+        else:
+            self._raw.close()
+            raise ValueError(f"Unknown compression: {compression}")
+        # newline=None writes "\n" as the platform line separator, like a
+        # file opened in text mode
+        self._linesep = os.linesep if newline is None else None
+        self._pending = []
+        self._pending_chars = 0
+
+    def write(self, text):
+        if self._linesep and "\n" in text:
+            text = text.replace("\n", self._linesep)
+        self.bytes += len(text) if text.isascii() else len(text.encode("utf-8"))
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= _WRITE_CHUNK_CHARS:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._stream.write("".join(self._pending).encode("utf-8"))
+            self._pending = []
+            self._pending_chars = 0
+
+    def close(self):
+        try:
+            self._flush()
+            if self._stream is not self._raw:
+                self._stream.close()
+            self.stored_bytes = self._raw.tell()
+        finally:
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _record_sizes(sizes, f):
+    """Copy an output file's sizes into the optional sizes dictionary."""
+    if sizes is not None:
+        sizes["bytes"] = f.bytes
+        sizes["stored_bytes"] = f.stored_bytes
+
+
+def write_json(path, rows, columns=COLUMNS, compression=None, sizes=None):
+    """Write rows as a JSON array of objects, one element at a time.
+
+    The output matches json.dump(list_of_rows, indent=2). If sizes is a
+    dictionary, the raw and stored sizes are put in it (bytes,
+    stored_bytes).
+    """
+    times = time_columns(columns)
+    count = 0
+    with _OutputFile(path, compression=compression, newline=None) as f:
+        f.write("[")
+        for row in rows:
+            element = json.dumps(dict(zip(columns, format_row(row, times))), indent=2)
+            f.write(",\n  " if count else "\n  ")
+            f.write(element.replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "]")
+    _record_sizes(sizes, f)
+    return count
+
+
+def write_ndjson(path, rows, append=False, columns=COLUMNS, compression=None, sizes=None):
+    """Write rows as newline-delimited JSON, one object per line.
+
+    With append, lines are added to the end of an existing file. sizes is
+    filled in as for write_json.
+    """
+    times = time_columns(columns)
+    count = 0
+    with _OutputFile(path, append, compression, newline=None) as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, format_row(row, times)))))
+            f.write("\n")
+            count += 1
+    _record_sizes(sizes, f)
+    return count
+
+
+# Data rows per XLSX sheet; Excel allows 1,048,576 rows including the header
+XLSX_MAX_ROWS = 1048575
+
+
+def part_path(path, number):
+    """Return the path of part number (from 1) of a sharded export.
+
+    A compression suffix stays last, e.g. out.part001.csv.gz.
+    """
+    root, ext = os.path.splitext(path)
+    if ext in COMPRESSION_SUFFIXES.values():
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    return f"{root}.part{number:03d}{ext}"
+
+
+def _new_part(parts, path, new_file=True, **extra):
+    """Append the next part to parts and return (file path, part).
+
+    An export that fits in one file keeps its plain file name; only when a
+    second file is started is the first renamed to .part001. With new_file
+    False the part shares the current file (e.g. another sheet).
+    """
+    if not parts:
+        file_path = path
+    elif new_file:
+        if len(parts) == 1:
+            first = part_path(path, 1)
+            os.replace(path, first)
+            parts[0]["file"] = os.path.basename(first)
+        file_path = part_path(path, len(parts) + 1)
+    else:
+        file_path = os.path.join(os.path.dirname(path), parts[-1]["file"])
+    first_row = parts[-1]["last_row"] + 1 if parts else 1
+    part = {
+        "file": os.path.basename(file_path),
+        "first_row": first_row,
+        "last_row": first_row - 1,
+        "rows": 0,
+    }
+    part.update(extra)
+    parts.append(part)
+    return file_path, part
+
+
+def write_csv_parts(
+    path,
+    rows,
+    max_rows=None,
+    max_bytes=None,
+    append=False,
+    columns=COLUMNS,
+    compression=None,
+):
+    """Write rows as CSV, starting a new part file when a limit is reached.
+
+    Parts are written as rows arrive; each has its own header line. A part
+    is closed once it holds max_rows rows or max_bytes bytes, so a part can
+    overshoot max_bytes by at most one row. With append, rows are added to
+    the end of an existing file at path (the header is only written if the
+    file is new); max_rows then counts only the rows added. max_bytes
+    applies to the uncompressed size.
+
+    Args:
+        path: Path of the CSV file (parts are named path.partNNN.csv)
+        rows: Iterable of rows from iter_rows
+        max_rows: Maximum data rows per part, or None
+        max_bytes: Approximate maximum bytes per part, or None
+        append: Add to an existing file instead of replacing it
+        columns: Column headers matching the rows
+        compression: None, "gzip" or "zstd"
+
+    Returns:
+        List of part dictionaries (file, first_row, last_row, rows, bytes,
+        stored_bytes)
+    """
+    times = time_columns(columns)
+    parts = []
+    f = writer = part = None
+
+    def _close():
+        f.close()
+        part["bytes"] = f.bytes
+        part["stored_bytes"] = f.stored_bytes
+
+    try:
+        for row in rows:
+            if part is None or (
+                (max_rows and part["rows"] >= max_rows) or (max_bytes and f.bytes >= max_bytes)
+            ):
+                if f is not None:
+                    _close()
+                    f = None
+                file_path, part = _new_part(parts, path)
+                f = _OutputFile(file_path, append and len(parts) == 1, compression)
+                writer = csv.writer(f)
+                if not f.bytes:
+                    writer.writerow(columns)
+            writer.writerow(format_row(row, times))
+            part["rows"] += 1
+            part["last_row"] += 1
+        if part is None:
+            # No rows: still write a file with just the header
+            file_path, part = _new_part(parts, path)
+            f = _OutputFile(file_path, append, compression)
+            if not f.bytes:
+                csv.writer(f).writerow(columns)
+    finally:
+        if f is not None:
+            _close()
+    return parts
+
+
+def write_csv(path, rows, columns=COLUMNS, compression=None):
+    """Write rows as CSV with a header line."""
+    parts = write_csv_parts(path, rows, columns=columns, compression=compression)
+    return parts[0]["rows"]
+
+
+def write_xlsx_parts(path, rows, max_rows=None, mode="sheets", columns=COLUMNS, extra_sheets=()):
+    """Write rows to XLSX with openpyxl's write-only mode, sharding as needed.
+
+    Rows are streamed into the sheet instead of building the workbook in
+    memory. Start and end times are written as real datetimes and the
+    duration as a number, so they sort and sum correctly in Excel. A part
+    holds at most max_rows rows and never more than Excel's sheet limit;
+    parts are extra sheets of one workbook or separate workbooks.
+    extra_sheets are written to the (first) workbook ahead of the rows.
+
+    Args:
+        path: Path of the workbook (file parts are named path.partNNN.xlsx)
+        rows: Iterable of rows from iter_rows
+        max_rows: Maximum data rows per part, or None for the sheet limit
+        mode: "sheets" or "files"
+        columns: Column headers matching the rows
+        extra_sheets: Sequence of (title, columns, rows) tables, e.g. the
+            tasks table of a normalized export
+
+    Returns:
+        List of part dictionaries (file, sheet, first_row, last_row, rows)
+
+    Raises:
+        ImportError: If openpyxl is not installed
+    """
+    from openpyxl import Workbook
+
+    limit = min(max_rows or XLSX_MAX_ROWS, XLSX_MAX_ROWS)
+    parts = []
+    wb = ws = part = None
+    file_path = path
+
+    def _start_part():
+        nonlocal wb, ws, part, file_path
+        if wb is None or mode == "files":
+            if wb is not None:
+                wb.save(file_path)
+            file_path, part = _new_part(parts, path, sheet="Sessions")
+            first = wb is None
+            wb = Workbook(write_only=True)
+            if first:
+                for title, sheet_columns, sheet_rows in extra_sheets:
+                    sheet = wb.create_sheet(title)
+                    sheet.append(sheet_columns)
+                    for row in sheet_rows:
+                        sheet.append(row)
+            ws = wb.create_sheet("Sessions")
+        else:
+            title = f"Sessions {len(parts) + 1}"
+            _, part = _new_part(parts, path, new_file=False, sheet=title)
+            ws = wb.create_sheet(title)
+        ws.append(columns)
+
+    for row in rows:
+        if part is None or part["rows"] >= limit:
+            _start_part()
+        ws.append(row)
+        part["rows"] += 1
+        part["last_row"] += 1
+    if part is None:
+        _start_part()
+    wb.save(file_path)
+    return parts
+
+
+def write_xlsx(path, rows):
+    """Write rows to a single-sheet XLSX workbook (see write_xlsx_parts)."""
+    return sum(part["rows"] for part in write_xlsx_parts(path, rows))
+
+
+def write_manifest(path, fmt, parts, columns=COLUMNS):
+    """Write a JSON manifest listing the parts of a sharded export.
+
+    Args:
+        path: Path of the manifest file
+        fmt: Export format of the parts (e.g. "csv")
+        parts: Part dictionaries returned by a *_parts writer
+        columns: Column headers of the parts
+    """
+    manifest = {
+        "format": fmt,
+        "columns": list(columns),
+        "rows": sum(part["rows"] for part in parts),
+        "parts": parts,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+# Rows per Arrow record batch (and Parquet row group)
+ARROW_BATCH_ROWS = 65536
+# Columns written with Arrow types other than string
+_ARROW_TIMESTAMP_COLUMNS = ("Start Time", "End Time")
+_ARROW_INT_COLUMNS = ("Duration (seconds)", "Total Duration (seconds)", "Sessions")
+_ARROW_DICTIONARY_COLUMNS = ("Task Name", "Task ID", "Status")
+_ARROW_NULLABLE_COLUMNS = ("Session Note", "Task Note")
+
+
+def pyarrow_available():
+    """Return True if pyarrow can be imported, without importing it."""
+    from importlib.util import find_spec
+
+    return find_spec("pyarrow") is not None
+
+
+def _arrow_schema(pa, columns):
+    """Build the Arrow schema for a column set.
+
+    Times are timestamps, durations and counts int64, repeated names
+    dictionary-encoded and notes nullable strings.
+    """
+    fields = []
+    for name in columns:
+        if name in _ARROW_TIMESTAMP_COLUMNS:
+            arrow_type = pa.timestamp("us")
+        elif name in _ARROW_INT_COLUMNS:
+            arrow_type = pa.int64()
+        elif name in _ARROW_DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _write_record_batches(pa, write_batch, rows, schema):
+    """Group rows into record batches and pass them to write_batch.
+
+    Dictionary columns share one growing dictionary across batches, so
+    later batches only add entries (as the Arrow IPC file format
+    requires) and each task name is stored once.
+    """
+    columns = schema.names
+    dictionaries = {i: {} for i, name in enumerate(columns) if name in _ARROW_DICTIONARY_COLUMNS}
+    nullable = {i for i, name in enumerate(columns) if name in _ARROW_NULLABLE_COLUMNS}
+
+    def _flush(batch):
+        arrays = []
+        for i, values in enumerate(zip(*batch)):
+            if i in dictionaries:
+                codes = dictionaries[i]
+                indices = [codes.setdefault(value, len(codes)) for value in values]
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(indices, pa.int32()), pa.array(list(codes), pa.string())
+                    )
+                )
+            else:
+                if i in nullable:
+                    values = [value or None for value in values]
+                arrays.append(pa.array(values, schema.field(i).type))
+        write_batch(pa.record_batch(arrays, schema=schema))
+
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= ARROW_BATCH_ROWS:
+            _flush(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        _flush(batch)
+        count += len(batch)
+    return count
+
+
+def write_parquet(path, rows, columns=COLUMNS):
+    """Write rows to a Parquet file with typed columns, one batch at a time.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa, columns)
+    with pq.ParquetWriter(path, schema) as writer:
+        return _write_record_batches(pa, writer.write_batch, rows, schema)
+
+
+def write_arrow(path, rows, columns=COLUMNS):
+    """Write rows to an Arrow IPC file with typed columns.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, columns)
+    options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        return _write_record_batches(pa, writer.write_batch, rows, schema)
@@ -1,9 +1,6 @@
 """Event handlers for PyChron application."""
 
-from datetime import datetime
-
 from models import Task
-from storage import save_tasks
 from ui import (
     confirm_delete,
     confirm_delete_all,
@@ -26,8 +23,18 @@ class TaskHandlers:
         """
         self.app = app
 
+    def _persist(self, op, **fields):
+        """Queue a single task mutation with the background autosave writer."""
+        self.app.autosave.submit(op, **fields)
+
+    def _persist_last_session(self, task):
+        """Record the session most recently appended to a task."""
+        self._persist("add_session", name=task.name, session=task.timings[-1].to_dict())
+
     def add_task(self, event=None):
         """Handle adding a new task."""
+        if not self.app.store_ready:
+            return  # Still loading; the entry is disabled
         task_name = self.app.task_entry.get().strip()
         if not task_name:
             task_name = prompt_task_name(self.app)
@@ -39,7 +46,7 @@ class TaskHandlers:
             self.app.tasks[task_name] = new_task
             self.app._add_task_to_ui(new_task)
             self.app.task_entry.delete(0, "end")
-            save_tasks(self.app.tasks)
+            self._persist("add_task", name=task_name, status=new_task.status, note=new_task.note)
             self.app._update_scrollbar_visibility()
 
     def toggle_collapse(self, task):
@@ -47,6 +54,12 @@ class TaskHandlers:
         if task.name in self.app.task_frames:
             info = self.app.task_frames[task.name]
             info["collapsed"] = not info.get("collapsed", False)
+            # Remembered outside the row, which may be reused for other tasks
+            if info["collapsed"]:
+                self.app.collapsed_tasks.add(task.name)
+            else:
+                self.app.collapsed_tasks.discard(task.name)
+            self.app.task_list.invalidate_height(task.name)
             collapse_btn = info.get("collapse_button")
             if collapse_btn:
                 collapse_btn.configure(text="▸" if info["collapsed"] else "▾")
@@ -54,38 +67,47 @@ class TaskHandlers:
             if timings_frame:
                 if info["collapsed"]:
                     timings_frame.grid_remove()
+                    self.app._schedule_table_teardown(info)
                 else:
                     timings_frame.grid()
-            try:
-                self.app.scrollable_frame.update_idletasks()
-            except Exception:
-                pass
-            try:
-                self.app.update_idletasks()
-            except Exception:
-                pass
-            self.app.after(10, self.app._update_scrollbar_visibility)
+                    self.app._cancel_table_teardown(info)
+                    # Build the session rows skipped while collapsed
+                    self.app._update_task_ui(task)
             self.app._update_scrollbar_visibility()
 
     def toggle_complete(self, task):
         """Toggle task completion status."""
         if task.status != "Completed":
+            was_running = task.timer_active
             task.complete_task()
+            if was_running:
+                self._persist_last_session(task)
         else:
             task.undo_complete()
+        self._track_timer(task)
         self.app._update_task_ui(task)
-        save_tasks(self.app.tasks)
-        self.app._redraw_task_list()
+        self._persist("update_task", name=task.name, status=task.status)
+        self.app._reconcile_task_list()
         self.app._update_export_button_state()
 
     def toggle_pause_resume(self, task):
         """Toggle timer pause/resume."""
         task.start_pause_timer()
+        self._track_timer(task)
         self.app._update_task_ui(task)
-        save_tasks(self.app.tasks)
-        self.app.after(10, self.app._update_scrollbar_visibility)
+        if not task.timer_active:
+            # Pausing closed a session; starting is not persisted
+            self._persist_last_session(task)
+            self.app._update_export_button_state()
         self.app._update_scrollbar_visibility()
 
+    def _track_timer(self, task):
+        """Keep the app's set of running tasks in step with task's timer."""
+        if task.timer_active:
+            self.app.running_tasks.add(task)
+        else:
+            self.app.running_tasks.discard(task)
+
     def edit_task_name(self, task):
         """Edit task name."""
         new_name = prompt_edit_task_name(self.app, current_name=task.name)
@@ -94,21 +116,16 @@ class TaskHandlers:
             old_name = task.name
             self.app.tasks[new_name] = self.app.tasks.pop(old_name)
             task.name = new_name
-            self.app.task_frames[new_name] = self.app.task_frames.pop(old_name)
-            self.app.task_frames[new_name]["name_label"].configure(text=new_name)
-            delete_btn = self.app.task_frames[new_name]["delete_button"]
-            delete_btn.configure(
-                command=lambda t_name=new_name: self.delete_task(t_name)
-            )
-            save_tasks(self.app.tasks)
+            self.app._rename_task_in_ui(old_name, new_name)
+            self._persist("rename_task", name=old_name, new_name=new_name)
 
     def delete_task(self, task_name):
         """Delete a task after confirmation."""
         if task_name in self.app.tasks:
             if confirm_delete(self.app, task_name):
-                del self.app.tasks[task_name]
-                save_tasks(self.app.tasks)
-                self.app._redraw_task_list()
+                self.app.running_tasks.discard(self.app.tasks.pop(task_name))
+                self._persist("delete_task", name=task_name)
+                self.app._reconcile_task_list()
                 self.app._update_scrollbar_visibility()
 
     def delete_all_tasks(self):
@@ -117,9 +134,10 @@ class TaskHandlers:
             return
 
         if confirm_delete_all(self.app):
+            self.app.running_tasks.clear()
             self.app.tasks.clear()
-            save_tasks(self.app.tasks)
-            self.app._redraw_task_list()
+            self._persist("clear")
+            self.app._reconcile_task_list()
             self.app._update_scrollbar_visibility()
             self.app._update_export_button_state()
 
@@ -127,63 +145,63 @@ class TaskHandlers:
         """Edit the name of a specific session."""
         if session_index >= len(task.timings):
             return
-        entry = task.timings[session_index]
-        current_name = entry.get("name")
-        new_name = prompt_session_name(self.app, current_name=current_name)
+        session = task.timings[session_index]
+        new_name = prompt_session_name(self.app, current_name=session.name)
         if new_name is not None:
-            entry["name"] = new_name if new_name.strip() else None
-            save_tasks(self.app.tasks)
-            self.app._update_task_ui(task)
+            task.update_session(session_index, name=new_name if new_name.strip() else None)
+            self._persist(
+                "update_session",
+                name=task.name,
+                index=session_index,
+                fields={"name": session.name},
+            )
+            self.app._update_session_row(task, session_index)
 
     def edit_session_note(self, task, session_index):
         """Edit the note for a specific session."""
-        entry = task.timings[session_index]
-        current_note = entry.get("note")
+        session = task.timings[session_index]
         title = f"Edit Note - Session {session_index + 1}"
-        new_note = prompt_note(self.app, current_note, title=title)
+        new_note = prompt_note(self.app, session.note, title=title)
         if new_note is not None:
-            entry["note"] = new_note if new_note else None
-            save_tasks(self.app.tasks)
-            self.app._update_task_ui(task)
+            task.update_session(session_index, note=new_note if new_note else None)
+            self._persist(
+                "update_session",
+                name=task.name,
+                index=session_index,
+                fields={"note": session.note},
+            )
+            self.app._update_session_row(task, session_index)
 
     def edit_task_note(self, task):
         """Edit the note for a task."""
         new_note = prompt_note(self.app, task.note, title=f"Edit Note - {task.name}")
         if new_note is not None:
             task.note = new_note if new_note else None
-            save_tasks(self.app.tasks)
+            self._persist("update_task", name=task.name, note=task.note)
             self.app._update_task_ui(task)
 
     def copy_task_results(self, task):
         """Copy task results to clipboard in Excel-friendly format."""
         lines = []
         # Header with all columns including Task Note
-        header = (
-            "Session\tStart Time\tEnd Time\t"
-            "Duration (seconds)\tSession Note\tTask Note"
-        )
+        header = "Session\tStart Time\tEnd Time\tDuration (seconds)\tSession Note\tTask Note"
         lines.append(header)
 
         # Get task note once
         task_note = task.note if task.note else ""
 
         # Add a row for each session
-        for i, entry in enumerate(task.timings):
-            start_dt = datetime.fromisoformat(entry["start"])
-            end_dt = datetime.fromisoformat(entry["end"])
-            start = start_dt.strftime("%H:%M:%S")
-            end = end_dt.strftime("%H:%M:%S")
-            duration_seconds = int((end_dt - start_dt).total_seconds())
-            session_name = entry.get("name") or f"Session {i + 1}"
-            session_note = entry.get("note") or ""
+        for i, session in enumerate(task.timings):
+            start = session.start.strftime("%H:%M:%S")
+            end = session.end.strftime("%H:%M:%S")
+            duration_seconds = session.seconds
+            session_name = session.display_name(i)
+            session_note = session.note or ""
             hours = duration_seconds // 3600
             minutes = (duration_seconds % 3600) // 60
             seconds = duration_seconds % 60
             duration_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            row = (
-                f"{session_name}\t{start}\t{end}\t{duration_time}\t"
-                f"{session_note}\t{task_note}"
-            )
+            row = f"{session_name}\t{start}\t{end}\t{duration_time}\t{session_note}\t{task_note}"
             lines.append(row)
 
         text = "\n".join(lines)
@@ -191,8 +209,33 @@ class TaskHandlers:
         self.app.clipboard_append(text)
         show_info(self.app, "Copied", "Task results copied to clipboard!")
 
-    def perform_export(self, out_dir, name, formats):
+    def perform_export(
+        self,
+        out_dir,
+        name,
+        formats,
+        incremental=None,
+        layout="denormalized",
+        compression=None,
+        start=None,
+        end=None,
+        statuses=("Completed",),
+        match=None,
+    ):
         """Wrapper to call the export module function."""
         from export import perform_export
 
-        perform_export(self.app.tasks, out_dir, name, formats, parent=self.app)
+        perform_export(
+            self.app.tasks,
+            out_dir,
+            name,
+            formats,
+            parent=self.app,
+            incremental=incremental,
+            layout=layout,
+            compression=compression,
+            start=start,
+            end=end,
+            statuses=statuses,
+            match=match,
+        )
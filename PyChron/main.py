@@ -1,7 +1,10 @@
 """PyChron Application - Main Entry Point."""
 
+import logging
 import os
+import queue
 import sys
+import time
 from datetime import datetime
 
 # Add the script's directory to the path so imports work
@@ -9,19 +12,47 @@ _script_dir = os.path.dirname(os.path.abspath(__file__))
 if _script_dir not in sys.path:
     sys.path.insert(0, _script_dir)
 
-import customtkinter as ctk  # noqa: E402
-from handlers import TaskHandlers  # noqa: E402
-from storage import load_tasks, save_tasks  # noqa: E402
-from ui import create_theme_toggle, export_dialog  # noqa: E402
-from utils import format_timedelta  # noqa: E402
+import customtkinter as ctk
+
+from constants import (
+    AUTOSAVE_ERROR_POLL_MS,
+    COLLAPSED_TABLE_TEARDOWN_MS,
+    LOAD_POLL_MS,
+    SESSION_TABLE_RENDERER,
+    STARTUP_BATCH_SIZE,
+    STARTUP_CHUNK_BUDGET_MS,
+)
+from handlers import TaskHandlers
+from storage import (
+    AutosaveWriter,
+    compact_storage,
+    load_tasks_async,
+    record_changes,
+)
+from ui import create_theme_toggle, export_dialog, show_error
+from ui.styles import StyleRegistry
+from ui.task_widgets import SessionTableCanvas, VirtualTaskList
+from utils import format_timedelta
 
 # Constants
 ACTIONS_FRAME_INDEX = 4  # Index of actions frame in table row tuple
+# Unscaled height estimates for task rows that have not been laid out yet
+TASK_ROW_BASE_HEIGHT = 120  # Header, button strip and padding
+SESSION_TABLE_HEADER_HEIGHT = 32
+SESSION_ROW_HEIGHT = 34
+TIMER_TICK_SLACK_MS = 5  # Fire this long after each second boundary
 
 
 # --- Main Application ---
 class PyChronApp(ctk.CTk):
     def __init__(self):
+        # Startup timings, filled in by the progressive render
+        self._startup_time = time.perf_counter()
+        self.startup_metrics = {
+            "loaded_ms": None,
+            "first_interactive_ms": None,
+            "fully_rendered_ms": None,
+        }
         super().__init__()
 
         self.title("PyChron")
@@ -34,15 +65,29 @@ class PyChronApp(ctk.CTk):
 
         self.current_theme = "Dark"
         ctk.set_appearance_mode(self.current_theme)
+        # Theme colors by role; widgets subscribe instead of being walked
+        self.styles = StyleRegistry(self.current_theme)
 
         # Set window icon (try to use Tkinterviz icon or default)
         # Must be called after window is fully initialized
         self.after(100, self._set_window_icon)
 
         self.tasks = {}
+        # Tasks whose timer is running, kept by the handlers that start,
+        # pause, complete and delete tasks so the tick only visits these
+        self.running_tasks = set()
         self.task_frames = {}
-
-        self.tasks = load_tasks()
+        self._deferred_names = set()
+
+        self.collapsed_tasks = set()
+        # Tasks are loaded on a worker thread while the window comes up;
+        # actions stay disabled until the store is ready (_poll_load_queue)
+        self.store_ready = False
+        self._load_results = queue.Queue()
+        load_tasks_async(self._load_results)
+        # Changes are written in coalesced batches off the Tk thread
+        self.autosave = AutosaveWriter(record_changes)
+        self.after(AUTOSAVE_ERROR_POLL_MS, self._poll_autosave_errors)
 
         # Initialize handlers
         self.handlers = TaskHandlers(self)
@@ -54,9 +99,7 @@ class PyChronApp(ctk.CTk):
         input_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
 
         # Task entry - auto-scales to fill remaining space
-        self.task_entry = ctk.CTkEntry(
-            input_frame, placeholder_text="Enter new task name"
-        )
+        self.task_entry = ctk.CTkEntry(input_frame, placeholder_text="Enter new task name")
         self.task_entry.pack(side="left", padx=(5, 0), pady=5, fill="x", expand=True)
         self.task_entry.bind("<Return>", self.handlers.add_task)
 
@@ -67,8 +110,8 @@ class PyChronApp(ctk.CTk):
         self.add_button.pack(side="left", padx=(10, 10), pady=5)
 
         # Theme toggle - simple switch
-        theme_switch_frame, theme_switch_var, theme_status_label = (
-            create_theme_toggle(input_frame, self.current_theme, self._toggle_theme)
+        theme_switch_frame, theme_switch_var, theme_status_label = create_theme_toggle(
+            input_frame, self.current_theme, self._toggle_theme
         )
         theme_switch_frame.pack(side="right", padx=(10, 5), pady=5)
         self.theme_switch_var = theme_switch_var
@@ -77,6 +120,22 @@ class PyChronApp(ctk.CTk):
         self.scrollable_frame = ctk.CTkScrollableFrame(self, label_text="Tasks")
         self.scrollable_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         self.scrollable_frame.grid_columnconfigure(0, weight=1)
+        # Scrollbar visibility is recomputed at most once per idle turn,
+        # whenever the viewport or the content changes size
+        self._scrollbar_dirty = False
+        self.layout_flushes = 0
+        self.layout_flushes_avoided = 0
+        for widget in (self.scrollable_frame._parent_canvas, self.scrollable_frame):
+            widget.bind("<Configure>", lambda e: self._update_scrollbar_visibility(), add="+")
+        self.task_list = VirtualTaskList(
+            self.scrollable_frame,
+            create_row=self._create_task_row,
+            bind_row=self._bind_task_row,
+            release_row=self._release_task_row,
+            estimate_height=self._estimate_task_row_height,
+            # add slightly larger bottom padding so frame's bottom border visible
+            pack_options={"fill": "x", "padx": 5, "pady": (5, 8)},
+        )
 
         # Hook into scrollbar's set method to auto-hide when not needed
         # Delay setup to ensure scrollbar is created
@@ -96,27 +155,22 @@ class PyChronApp(ctk.CTk):
 
         self.export_button = ctk.CTkButton(
             actions_frame,
-            text="Export Completed...",
+            text="Export...",
             command=lambda: export_dialog(self, self.handlers.perform_export),
         )
         self.export_button.pack(side="right", padx=5, pady=5)
 
-        self._redraw_task_list()
         # apply theme colors to avoid pure-black backgrounds
-        try:
-            self._apply_theme_colors()
-        except Exception:
-            pass
-        # enable/disable export depending on completed tasks
-        try:
-            self._update_export_button_state()
-        except Exception:
-            pass
-        # Update scrollbar visibility after initial setup
-        # Use multiple delays to ensure layout is fully complete
-        self.after(50, self._update_scrollbar_visibility)
-        self.after(200, self._update_scrollbar_visibility)
-        self.after(500, self._update_scrollbar_visibility)
+        self.styles.subscribe(self, fg_color="main_bg")
+        self.styles.subscribe(self.scrollable_frame, fg_color="container_bg")
+        self.styles.subscribe(self.task_list.top_spacer, bg="container_bg")
+        self.styles.subscribe(self.task_list.bottom_spacer, bg="container_bg")
+        self._render_placeholder = None
+        self._show_placeholder("Loading tasks...")
+        self._set_actions_enabled(False)
+        self.after(LOAD_POLL_MS, self._poll_load_queue)
+        # Update scrollbar visibility once the initial layout is done
+        self._update_scrollbar_visibility()
         self._update_timers()
 
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -127,160 +181,59 @@ class PyChronApp(ctk.CTk):
         self.current_theme = "Light" if self.current_theme == "Dark" else "Dark"
 
         # Update switch state and status label immediately
-        if hasattr(self, "theme_switch_var") and hasattr(
-            self, "theme_status_label"
-        ):
+        if hasattr(self, "theme_switch_var") and hasattr(self, "theme_status_label"):
             switch_val = "on" if self.current_theme == "Light" else "off"
             self.theme_switch_var.set(switch_val)
             status_text = "Light" if self.current_theme == "Light" else "Dark"
             self.theme_status_label.configure(text=status_text)
 
-        # Prepare all color updates
-        container_bg = self._get_container_bg()
-        text_color = "#000000" if self.current_theme == "Light" else "#FFFFFF"
-        hdr_bg = "#E0E0E0" if self.current_theme == "Light" else "#3a3a3a"
-        hdr_text_color = "#000000" if self.current_theme == "Light" else "#FFFFFF"
-
         # Disable window updates temporarily to prevent flicker
         try:
             self.update_idletasks()
         except Exception:
             pass
 
-        # Update all colors FIRST - before appearance mode change
-        try:
-            self._apply_theme_colors()
-        except Exception:
-            pass
-
-        # Update ALL frames with proper backgrounds BEFORE appearance change
-        for task_name, task_data in self.task_frames.items():
-            # Update main frame background
-            frame = task_data.get("frame")
-            if frame:
-                try:
-                    frame.configure(fg_color=container_bg)
-                except Exception:
-                    pass
-
-            # Update timings_frame and table_frame backgrounds
-            timings_frame = task_data.get("timings_frame")
-            table_frame = task_data.get("table_frame")
-            if timings_frame:
-                timings_frame.configure(fg_color=container_bg)
-            if table_frame:
-                table_frame.configure(fg_color=container_bg)
-
-            # Update header colors
-            if table_frame:
-                for widget in table_frame.winfo_children():
-                    try:
-                        info = widget.grid_info()
-                    except Exception:
-                        info = {}
-                    if isinstance(widget, ctk.CTkLabel) and info.get("row") == 0:
-                        widget.configure(fg_color=hdr_bg, text_color=hdr_text_color)
-
-                # Update all table row labels with proper theme colors
-                if table_frame:
-                    for widget in table_frame.winfo_children():
-                        try:
-                            info = widget.grid_info()
-                        except Exception:
-                            info = {}
-                        row_num = info.get("row", 0)
-                        # Update data rows (row > 0) with proper background
-                        if isinstance(widget, ctk.CTkLabel) and row_num > 0:
-                            widget.configure(
-                                fg_color=container_bg, text_color=text_color
-                            )
-                        # Update session frames and actions frames
-                        elif isinstance(widget, ctk.CTkFrame) and row_num > 0:
-                            widget.configure(fg_color=container_bg)
-                            # Update children (pencil icon, note button, etc.)
-                            for child in widget.winfo_children():
-                                if isinstance(child, ctk.CTkButton):
-                                    # Check if it's a pencil icon or note button
-                                    child_text = child.cget("text")
-                                    if child_text == "✏":
-                                        # Pencil icon - update theme colors
-                                        light_fg = "#E0E0E0"
-                                        dark_fg = "#555555"
-                                        light_hover = "#BDBDBD"
-                                        dark_hover = "#777777"
-                                        light_text = "#000000"
-                                        dark_text = "#FFFFFF"
-                                        child.configure(
-                                            fg_color=(
-                                                light_fg
-                                                if self.current_theme == "Light"
-                                                else dark_fg
-                                            ),
-                                            hover_color=(
-                                                light_hover
-                                                if self.current_theme == "Light"
-                                                else dark_hover
-                                            ),
-                                            text_color=(
-                                                light_text
-                                                if self.current_theme == "Light"
-                                                else dark_text
-                                            ),
-                                        )
-                                    elif "Note" in child_text or "Add" in child_text:
-                                        # Note button - keep yellow colors but
-                                        # ensure frame background is correct
-                                        pass
-                                elif isinstance(child, ctk.CTkLabel):
-                                    child.configure(
-                                        fg_color=container_bg,
-                                        text_color=text_color,
-                                    )
-
-        # Update input frame widgets manually to prevent rebuild
-        try:
-            for widget in self.winfo_children():
-                if isinstance(widget, ctk.CTkFrame):
-                    # Update input frame and its children
-                    for child in widget.winfo_children():
-                        if isinstance(child, ctk.CTkEntry):
-                            # Entry colors are handled by appearance mode,
-                            # but we can update other properties if needed
-                            pass
-                        elif isinstance(child, ctk.CTkButton):
-                            # Button colors are handled by appearance mode,
-                            # but we can update other properties if needed
-                            pass
-        except Exception:
-            pass
+        # Restyle window-level widgets and realized task rows first. Pooled
+        # rows are restyled when they are bound again, so this does not
+        # depend on the number of tasks.
+        self.styles.set_theme(
+            self.current_theme,
+            groups=[info["style_group"] for info in self.task_frames.values()],
+        )
 
         # Force all updates to complete before appearance mode change
         self.update_idletasks()
 
         # Update appearance mode - CustomTkinter will update default widget colors
-        # We've already manually updated all our custom widgets above.
+        # We've already restyled our custom widgets above.
         #
         # NOTE: CustomTkinter's set_appearance_mode() internally rebuilds widgets,
         # which can cause the window to appear to close/reopen. This is a known
         # limitation of CustomTkinter. To completely avoid this, we would need to
         # manually update every single widget color without calling
         # set_appearance_mode(), which is complex and error-prone. The current
-        # approach minimizes the visual disruption by updating all custom widgets
-        # manually first.
+        # approach minimizes the visual disruption by restyling custom widgets
+        # first.
         ctk.set_appearance_mode(self.current_theme)
 
         # Force update after appearance mode change
         self.update_idletasks()
 
-    def _redraw_task_list(self):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.task_frames = {}
-        # Sort tasks to show "In Progress" first
-        sorted_tasks = sorted(self.tasks.values(), key=lambda t: t.status)
-        for task in sorted_tasks:
-            self._add_task_to_ui(task)
-        # Ensure export button state is kept up-to-date after redrawing
+    def _reconcile_task_list(self):
+        """Bring the displayed task order in line with self.tasks.
+
+        Existing rows are kept; only rows that were inserted, removed or
+        moved (e.g. a task changing status group) are re-packed.
+        """
+        # Sort tasks to show "In Progress" first, so completed tasks added by
+        # the progressive startup land below the rows painted first
+        sorted_tasks = sorted(self.tasks.values(), key=lambda t: t.status == "Completed")
+        if self._deferred_names:
+            # Completed tasks not yet added by the progressive startup
+            sorted_tasks = [t for t in sorted_tasks if t.name not in self._deferred_names]
+        # Only rows near the viewport are built; the rest are pooled
+        self.task_list.set_order([task.name for task in sorted_tasks])
+        # Ensure export button state is kept up-to-date after reordering
         try:
             self._update_export_button_state()
         except Exception:
@@ -288,6 +241,110 @@ class PyChronApp(ctk.CTk):
         # Hide scrollbar if content doesn't fill the window
         self._update_scrollbar_visibility()
 
+    def _poll_load_queue(self):
+        """Pick up the background load result, or check again shortly."""
+        try:
+            status, result = self._load_results.get_nowait()
+        except queue.Empty:
+            self.after(LOAD_POLL_MS, self._poll_load_queue)
+            return
+        if status == "error":
+            # Leave actions disabled so nothing overwrites the unread data
+            self._show_placeholder("Tasks could not be loaded.")
+            show_error(self, "Load Error", f"Failed to load tasks:\n{result}")
+            return
+        self.startup_metrics["loaded_ms"] = self._startup_elapsed_ms()
+        self.tasks = result
+        # Lazily loaded tasks start collapsed so their sessions stay on disk
+        self.collapsed_tasks = {task.name for task in self.tasks.values() if not task.is_loaded}
+        self.store_ready = True
+        self._set_actions_enabled(True)
+        self._start_progressive_render()
+
+    def _poll_autosave_errors(self):
+        """Tell the user about changes the autosave writer had to skip."""
+        skipped = self.autosave.take_skipped()
+        if skipped:
+            error = skipped[-1][1]
+            show_error(
+                self,
+                "Save Error",
+                f"{len(skipped)} change(s) could not be saved and were skipped:\n{error}",
+            )
+        self.after(AUTOSAVE_ERROR_POLL_MS, self._poll_autosave_errors)
+
+    def _set_actions_enabled(self, enabled):
+        """Enable or disable the task entry and the action buttons."""
+        state = "normal" if enabled else "disabled"
+        for widget in (self.task_entry, self.add_button, self.delete_all_button):
+            try:
+                widget.configure(state=state)
+            except Exception:
+                pass
+        # enable/disable export depending on completed tasks
+        self._update_export_button_state()
+
+    def _show_placeholder(self, text):
+        """Show a status line at the end of the task list."""
+        if self._render_placeholder is None:
+            self._render_placeholder = ctk.CTkLabel(self.scrollable_frame, text="")
+            self.styles.subscribe(self._render_placeholder, text_color="text")
+            self._render_placeholder.pack(after=self.task_list.bottom_spacer, pady=10)
+        self._render_placeholder.configure(text=text)
+
+    def _hide_placeholder(self):
+        if self._render_placeholder is not None:
+            self._render_placeholder.destroy()
+            self._render_placeholder = None
+
+    def _start_progressive_render(self):
+        """Show in-progress tasks now and add completed ones in idle chunks.
+
+        Completed tasks sort after in-progress ones in their stored order,
+        so each chunk is appended to the end of the list.
+        """
+        completed = [t.name for t in self.tasks.values() if t.status == "Completed"]
+        self._deferred_names = set(completed)
+        self._deferred_queue = completed
+        self._deferred_total = len(completed)
+        self._reconcile_task_list()
+        if completed:
+            self._update_render_placeholder()
+        else:
+            self._hide_placeholder()
+        self.after_idle(self._render_next_chunk)
+
+    def _render_next_chunk(self):
+        """Add deferred tasks in batches until this idle turn's budget is spent."""
+        if self.startup_metrics["first_interactive_ms"] is None:
+            self.startup_metrics["first_interactive_ms"] = self._startup_elapsed_ms()
+        deadline = time.perf_counter() + STARTUP_CHUNK_BUDGET_MS / 1000
+        while self._deferred_queue and time.perf_counter() < deadline:
+            batch = self._deferred_queue[:STARTUP_BATCH_SIZE]
+            del self._deferred_queue[:STARTUP_BATCH_SIZE]
+            self._deferred_names.difference_update(batch)
+            # Skip tasks deleted (e.g. by Delete All) while they waited
+            self.task_list.extend([name for name in batch if name in self.tasks])
+        if self._deferred_queue:
+            self._update_render_placeholder()
+            self.after_idle(self._render_next_chunk)
+            return
+        self._hide_placeholder()
+        # One full pass at the end, for tasks changed while chunks were added
+        self._reconcile_task_list()
+        # Record once the last chunk has been drawn
+        self.after_idle(self._record_fully_rendered)
+
+    def _update_render_placeholder(self):
+        done = self._deferred_total - len(self._deferred_queue)
+        self._show_placeholder(f"Loading completed tasks... {done} / {self._deferred_total}")
+
+    def _record_fully_rendered(self):
+        self.startup_metrics["fully_rendered_ms"] = self._startup_elapsed_ms()
+
+    def _startup_elapsed_ms(self):
+        return round((time.perf_counter() - self._startup_time) * 1000, 1)
+
     def _setup_auto_hide_scrollbar(self):
         """Set up auto-hiding scrollbar by hooking into its set method."""
         try:
@@ -339,104 +396,70 @@ class PyChronApp(ctk.CTk):
             pass
 
     def _update_scrollbar_visibility(self):
-        """Update scrollbar visibility based on content height."""
-        try:
-            # Update all idle tasks first
-            self.update_idletasks()
-            self.scrollable_frame.update_idletasks()
+        """Request a scrollbar visibility check on the next idle turn.
 
-            # Force the scrollable frame to update its scroll region
-            canvas = None
-            bbox = None
-            try:
-                canvas = self.scrollable_frame._parent_canvas
-                if canvas:
-                    # Update scroll region to include all content
-                    canvas.update_idletasks()
-                    bbox = canvas.bbox("all")
-                    if bbox:
-                        # Update scroll region - this triggers scrollbar update
-                        canvas.config(scrollregion=bbox)
-                    canvas.update_idletasks()
-
-                    # Get the yscrollcommand callback and call it to update scrollbar
-                    yscrollcommand = canvas.cget("yscrollcommand")
-                    if yscrollcommand and bbox:
-                        try:
-                            canvas_height = canvas.winfo_height()
-                            content_height = bbox[3] - bbox[1]
-                            if content_height > canvas_height:
-                                # Content exceeds viewport - calculate scroll position
-                                top = canvas.canvasy(0)
-                                first = max(0.0, min(1.0, top / content_height))
-                                last = max(
-                                    0.0,
-                                    min(1.0, (top + canvas_height) / content_height),
-                                )
-                                # Call the yscrollcommand to update scrollbar
-                                # This will trigger our auto-hide logic
-                                yscrollcommand(first, last)
-                            else:
-                                # Content fits - call with values that hide scrollbar
-                                yscrollcommand(0.0, 1.0)
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-
-            # Also force a check by triggering the scrollbar's set method directly
-            # This ensures our auto-hide logic runs
-            scrollbar = self.scrollable_frame._scrollbar
-            if scrollbar:
-                try:
-                    first, last = scrollbar.get()
-                    scrollbar.set(first, last)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-    def _apply_theme_colors(self):
-        """Apply a small set of container colors based on the active theme.
-
-        This centralizes a few background/foreground choices so dynamic
-        theme changes look consistent (avoids pure-black backgrounds).
+        Requests only set a dirty flag, so any number of layout changes in
+        one event loop turn cost a single layout flush in
+        _recompute_scrollbar_visibility.
         """
-        if self.current_theme == "Light":
-            main_bg = "#F5F5F5"
-            container_bg = "#FFFFFF"
-        else:
-            main_bg = "#1f1f1f"
-            container_bg = "#2b2b2b"
-
+        if self._scrollbar_dirty:
+            self.layout_flushes_avoided += 1
+            return
+        self._scrollbar_dirty = True
         try:
-            self.configure(fg_color=main_bg)
+            self.after_idle(self._recompute_scrollbar_visibility)
         except Exception:
-            pass
+            self._scrollbar_dirty = False
 
+    def _recompute_scrollbar_visibility(self):
+        """Show or hide the scrollbar based on content height."""
+        self._scrollbar_dirty = False
+        self.layout_flushes += 1
         try:
-            self.scrollable_frame.configure(fg_color=container_bg)
+            canvas = self.scrollable_frame._parent_canvas
+            # Bring pending geometry up to date, then refresh the scroll region
+            canvas.update_idletasks()
+            bbox = canvas.bbox("all")
+            if bbox:
+                canvas.config(scrollregion=bbox)
+
+            # Feed the current view through the scrollbar's set method so the
+            # auto-hide logic runs
+            scrollbar = self.scrollable_frame._scrollbar
+            if scrollbar:
+                first, last = canvas.yview()
+                scrollbar.set(first, last)
         except Exception:
             pass
 
-    def _get_container_bg(self):
-        """Return a sensible container background color for the active theme."""
-        return "#FFFFFF" if self.current_theme == "Light" else "#2b2b2b"
-
     def _update_export_button_state(self):
-        """Enable/disable export button depending on whether completed tasks exist."""
-        completed = any(t.status == "Completed" for t in self.tasks.values())
+        """Enable/disable export button depending on whether any task has sessions.
+
+        The export dialog can include in-progress tasks, so any recorded
+        session is enough. session_count does not load lazy tasks.
+        """
+        exportable = self.store_ready and any(t.session_count for t in self.tasks.values())
         try:
-            self.export_button.configure(state=("normal" if completed else "disabled"))
+            self.export_button.configure(state=("normal" if exportable else "disabled"))
         except Exception:
             pass
 
     def _add_task_to_ui(self, task):
+        self.task_list.append(task.name)
+        # Update scrollbar visibility after adding task
+        self._update_scrollbar_visibility()
+
+    def _create_task_row(self):
+        """Build the widgets for one task row, not yet bound to a task.
+
+        Commands look up the row's current task when invoked, so the row can
+        be rebound to a different task by the virtual task list.
+        """
+        info = {"task": None}
+        group = info["style_group"] = id(info)
         # Use theme-appropriate background for the main frame
-        container_bg = self._get_container_bg()
-        frame = ctk.CTkFrame(self.scrollable_frame, fg_color=container_bg)
-        # add slightly larger bottom padding so frame's bottom border visible
-        frame.pack(fill="x", padx=5, pady=(5, 8))
+        frame = ctk.CTkFrame(self.scrollable_frame)
+        self.styles.subscribe(frame, group, fg_color="container_bg")
         frame.grid_columnconfigure(0, weight=1)
 
         header_frame = ctk.CTkFrame(frame)
@@ -458,7 +481,7 @@ class PyChronApp(ctk.CTk):
             hover_color="#004A99",
             border_width=0,
             corner_radius=6,
-            command=lambda t=task: self.handlers.edit_task_name(t),  # noqa: E501
+            command=lambda info=info: self.handlers.edit_task_name(info["task"]),
             text_color="#FFFFFF",
             font=ctk.CTkFont(size=10, weight="bold"),
         )
@@ -466,22 +489,20 @@ class PyChronApp(ctk.CTk):
 
         task_name_label = ctk.CTkLabel(
             header_frame,
-            text=task.name,
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
         )
         task_name_label.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
         # Task note button - muted yellow for both themes
-        has_task_note = bool(task.note)
+        # (text and colors are set from the task's note when bound)
         task_note_btn = ctk.CTkButton(
             header_frame,
-            text="Note" if has_task_note else "Add Note",
+            text="Add Note",
             width=100,
             height=28,
-            fg_color="#F9A825" if has_task_note else "#F5F5DC",
-            hover_color="#F57F17" if has_task_note else "#E8E8D3",
-            text_color="#000000",
-            command=lambda t=task: self.handlers.edit_task_note(t),
+            **self.styles.note_button_options(False),
+            command=lambda info=info: self.handlers.edit_task_note(info["task"]),
             font=ctk.CTkFont(size=10),
         )
         task_note_btn.grid(row=0, column=2, padx=(5, 10), pady=5, sticky="w")
@@ -501,7 +522,7 @@ class PyChronApp(ctk.CTk):
             border_color="#888888",
             corner_radius=6,
             text_color="#FFFFFF",
-            command=lambda t=task: self.handlers.toggle_collapse(t),
+            command=lambda info=info: self.handlers.toggle_collapse(info["task"]),
         )
         collapse_button.grid(row=0, column=4, padx=(6, 8), pady=6, sticky="e")
 
@@ -519,14 +540,14 @@ class PyChronApp(ctk.CTk):
         pause_button = ctk.CTkButton(
             button_frame,
             text="Start",
-            command=lambda t=task: self.handlers.toggle_pause_resume(t),
+            command=lambda info=info: self.handlers.toggle_pause_resume(info["task"]),
         )
         pause_button.pack(side="left", padx=5, pady=4)
 
         complete_button = ctk.CTkButton(
             button_frame,
             text="Complete Task",
-            command=lambda t=task: self.handlers.toggle_complete(t),
+            command=lambda info=info: self.handlers.toggle_complete(info["task"]),
         )
         complete_button.pack(side="left", padx=5, pady=4)
 
@@ -536,7 +557,7 @@ class PyChronApp(ctk.CTk):
             text="Copy Results",
             fg_color="#4CAF50",
             hover_color="#45a049",
-            command=lambda t=task: self.handlers.copy_task_results(t),
+            command=lambda info=info: self.handlers.copy_task_results(info["task"]),
         )
         copy_button.pack(side="left", padx=5, pady=4)
 
@@ -546,15 +567,13 @@ class PyChronApp(ctk.CTk):
             text="Delete Task",
             fg_color="#D32F2F",
             hover_color="#B71C1C",
-            command=lambda t_name=task.name: self.handlers.delete_task(  # noqa: E501
-                t_name
-            ),
+            command=lambda info=info: self.handlers.delete_task(info["task"].name),
         )
         delete_button.pack(side="right", padx=5, pady=4)
 
         # Use theme-appropriate background for timings_frame
-        container_bg = self._get_container_bg()
-        timings_frame = ctk.CTkFrame(frame, fg_color=container_bg)
+        timings_frame = ctk.CTkFrame(frame)
+        self.styles.subscribe(timings_frame, group, fg_color="container_bg")
         # add internal bottom padding so timings don't overlap parent border
         timings_frame.grid(
             row=2,
@@ -566,9 +585,57 @@ class PyChronApp(ctk.CTk):
         )
         timings_frame.grid_columnconfigure(0, weight=1)
 
+        # The session table is built on first expand (_build_session_table)
+        info.update(
+            {
+                "frame": frame,
+                "name_label": task_name_label,
+                "duration_label": duration_label,
+                "pause_button": pause_button,
+                "complete_button": complete_button,
+                "edit_button": edit_icon,
+                "delete_button": delete_button,
+                "note_button": task_note_btn,
+                "copy_button": copy_button,
+                "timings_frame": timings_frame,
+                "table_frame": None,
+                "table_rows": [],
+                "current_row": None,
+                "collapsed": False,
+                "collapse_button": collapse_button,
+                "teardown_job": None,
+            }
+        )
+        return info
+
+    def _bind_task_row(self, info, name):
+        """Show the task called name in a row from _create_task_row."""
+        task = self.tasks[name]
+        info["task"] = task
+        info["name_label"].configure(text=name)
+        collapsed = name in self.collapsed_tasks
+        info["collapsed"] = collapsed
+        info["collapse_button"].configure(text="▸" if collapsed else "▾")
+        if collapsed:
+            info["timings_frame"].grid_remove()
+            self._schedule_table_teardown(info)
+        else:
+            info["timings_frame"].grid()
+            self._cancel_table_teardown(info)
+        # Pooled rows may have been styled for the previous theme
+        self.styles.ensure_current(info["style_group"])
+        self.task_frames[name] = info
+        self._update_task_ui(task)
+
+    def _build_session_table(self, info):
+        """Create a row's session table frame and header on first expand."""
+        if SESSION_TABLE_RENDERER == "canvas":
+            return self._build_session_canvas(info)
         # create a table_frame inside timings_frame and add header row
         # (Session | Start | End | Duration | Actions)
-        table_frame = ctk.CTkFrame(timings_frame, fg_color=container_bg)
+        group = info["style_group"]
+        table_frame = ctk.CTkFrame(info["timings_frame"])
+        self.styles.subscribe(table_frame, group, fg_color="container_bg")
         table_frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         # Ensure columns are evenly distributed across available width
         table_frame.grid_columnconfigure(0, weight=1, uniform="col")
@@ -580,78 +647,194 @@ class PyChronApp(ctk.CTk):
 
         # header row with distinct styling (light backgrounds for contrast)
         hdr_font = ctk.CTkFont(size=10, weight="bold")
-        # Use light backgrounds to stand out in both light and dark modes
-        hdr_bg = "#E0E0E0" if self.current_theme == "Light" else "#3a3a3a"
-        hdr_text_color = "#000000" if self.current_theme == "Light" else "#FFFFFF"
         hdr_session = ctk.CTkLabel(
             table_frame,
             text="Session",
             font=hdr_font,
-            fg_color=hdr_bg,
-            text_color=hdr_text_color,
         )
         hdr_start = ctk.CTkLabel(
             table_frame,
             text="Start",
             font=hdr_font,
-            fg_color=hdr_bg,
-            text_color=hdr_text_color,
         )
         hdr_end = ctk.CTkLabel(
             table_frame,
             text="End",
             font=hdr_font,
-            fg_color=hdr_bg,
-            text_color=hdr_text_color,
         )
         hdr_dur = ctk.CTkLabel(
             table_frame,
             text="Duration",
             font=hdr_font,
-            fg_color=hdr_bg,
-            text_color=hdr_text_color,
         )
         hdr_actions = ctk.CTkLabel(
             table_frame,
             text="Actions",
             font=hdr_font,
-            fg_color=hdr_bg,
-            text_color=hdr_text_color,
         )
 
+        # Use light backgrounds to stand out in both light and dark modes
+        for hdr in (hdr_session, hdr_start, hdr_end, hdr_dur, hdr_actions):
+            self.styles.subscribe(hdr, group, fg_color="header_bg", text_color="header_text")
+
         hdr_session.grid(row=0, column=0, sticky="ew", padx=6, pady=(4, 2))
         hdr_start.grid(row=0, column=1, sticky="ew", padx=6, pady=(4, 2))
         hdr_end.grid(row=0, column=2, sticky="ew", padx=6, pady=(4, 2))
         hdr_dur.grid(row=0, column=3, sticky="ew", padx=6, pady=(4, 2))
         hdr_actions.grid(row=0, column=4, sticky="ew", padx=6, pady=(4, 2))
+        info["table_frame"] = table_frame
+        return table_frame
+
+    def _build_session_canvas(self, info):
+        """Create a canvas-drawn session table (no widgets per session)."""
+        table = SessionTableCanvas(
+            info["timings_frame"],
+            on_edit_name=lambda idx, info=info: self.handlers.edit_session_name(info["task"], idx),
+            on_edit_note=lambda idx, info=info: self.handlers.edit_session_note(info["task"], idx),
+        )
+        self.styles.subscribe(
+            table,
+            info["style_group"],
+            bg="container_bg",
+            text_color="text",
+            header_bg="header_bg",
+            header_text="header_text",
+            note_set_bg="note_set_bg",
+            note_empty_bg="note_empty_bg",
+            note_text="note_text",
+        )
+        table.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+        info["table_frame"] = table
+        return table
+
+    def _update_session_canvas(self, task, table):
+        """Sync a canvas session table with the task's sessions."""
+        timings = task.timings
+        table.truncate(len(timings))
+        for i in range(table.row_count, len(timings)):
+            table.append_row(*self._session_cells(i, timings[i]))
+        if task.timer_active and task.current_start_time:
+            start = task.current_start_time.strftime("%H:%M:%S")
+            running_str = format_timedelta(datetime.now() - task.current_start_time)
+            table.set_running((f"Session {len(timings) + 1}", start, "(running)", running_str))
+        else:
+            table.set_running(None)
+
+    def _session_cells(self, i, session):
+        """Return (name, start, end, duration, has_note) display values."""
+        return (
+            session.display_name(i),
+            session.start.strftime("%H:%M:%S"),
+            session.end.strftime("%H:%M:%S"),
+            format_timedelta(session.duration),
+            bool(session.note),
+        )
 
-        self.task_frames[task.name] = {
-            "frame": frame,
-            "name_label": task_name_label,
-            "duration_label": duration_label,
-            "pause_button": pause_button,
-            "complete_button": complete_button,
-            "edit_button": edit_icon,
-            "delete_button": delete_button,
-            "note_button": task_note_btn,
-            "copy_button": copy_button,
-            "timings_frame": timings_frame,
-            "table_frame": table_frame,
-            "table_rows": [],
-            "current_row": None,
-            "collapsed": False,
-            "collapse_button": collapse_button,
-        }
-        self._update_task_ui(task)
-        # Update scrollbar visibility after adding task
-        self.after(10, self._update_scrollbar_visibility)
+    def _teardown_session_table(self, info):
+        """Destroy a collapsed row's session table to free its widgets."""
+        info["teardown_job"] = None
+        if not info.get("collapsed") or info.get("table_frame") is None:
+            return
+        try:
+            info["table_frame"].destroy()
+        except Exception:
+            pass
+        info["table_frame"] = None
+        info["table_rows"] = []
+        info["current_row"] = None
+
+    def _schedule_table_teardown(self, info):
+        """Tear down a row's table if it stays collapsed past the threshold."""
+        self._cancel_table_teardown(info)
+        if COLLAPSED_TABLE_TEARDOWN_MS is None or info.get("table_frame") is None:
+            return
+        info["teardown_job"] = self.after(
+            COLLAPSED_TABLE_TEARDOWN_MS, lambda: self._teardown_session_table(info)
+        )
+
+    def _cancel_table_teardown(self, info):
+        job = info.get("teardown_job")
+        if job is not None:
+            try:
+                self.after_cancel(job)
+            except Exception:
+                pass
+            info["teardown_job"] = None
+
+    def _release_task_row(self, info, name):
+        """Detach a row from its task before the row is pooled for reuse."""
+        self.task_frames.pop(name, None)
+        if isinstance(info["table_frame"], SessionTableCanvas):
+            info["table_frame"].truncate(0)
+            info["table_frame"].set_running(None)
+        for row in info["table_rows"]:
+            for cell in row:
+                try:
+                    cell.destroy()
+                except Exception:
+                    pass
+        info["table_rows"] = []
+        if info["current_row"]:
+            for cell in info["current_row"]:
+                try:
+                    cell.destroy()
+                except Exception:
+                    pass
+            info["current_row"] = None
+        info["task"] = None
+
+    def _estimate_task_row_height(self, name):
+        """Estimate a task row's height in pixels before it has been measured."""
+        task = self.tasks.get(name)
+        height = TASK_ROW_BASE_HEIGHT
+        if task is not None and name not in self.collapsed_tasks:
+            rows = task.session_count + (1 if task.timer_active else 0)
+            height += SESSION_TABLE_HEADER_HEIGHT + rows * SESSION_ROW_HEIGHT
+        try:
+            scaling = self.scrollable_frame._get_widget_scaling()
+        except Exception:
+            scaling = 1.0
+        return int(height * scaling)
+
+    def _rename_task_in_ui(self, old_name, new_name):
+        """Move a task's row, collapse state and cached height to its new name."""
+        if old_name in self.collapsed_tasks:
+            self.collapsed_tasks.discard(old_name)
+            self.collapsed_tasks.add(new_name)
+        self.task_list.rename(old_name, new_name)
+        info = self.task_frames.pop(old_name, None)
+        if info is not None:
+            self.task_frames[new_name] = info
+            info["name_label"].configure(text=new_name)
 
     def _update_timers(self):
-        # Only update UI every second for tasks with active timers to avoid flicker
-        for task in self.tasks.values():
-            if task.timer_active:
-                self._update_task_ui(task)
-        self.after(1000, self._update_timers)
+        # Only running tasks are visited, and only their duration label and
+        # running-row cell are touched
+        now = datetime.now()
+        for task in list(self.running_tasks):
+            self._tick_task(task, now)
+        # Schedule the next tick just after the next wall-clock second so
+        # the per-call overhead does not accumulate as drift
+        delay_ms = 1000 - now.microsecond // 1000 + TIMER_TICK_SLACK_MS
+        self.after(delay_ms, self._update_timers)
+
+    def _tick_task(self, task, now):
+        """Refresh the live duration displays of a running task."""
+        info = self.task_frames.get(task.name)
+        if info is None or info["task"] is not task or not task.current_start_time:
+            return  # Row not realized; it is rendered in full when bound
+        info["duration_label"].configure(
+            text=f"Total: {format_timedelta(task.get_total_duration())}"
+        )
+        running_str = format_timedelta(now - task.current_start_time)
+        current_row = info.get("current_row")
+        if current_row:
+            try:
+                current_row[3].configure(text=running_str)
+            except Exception:
+                pass
+        elif isinstance(info["table_frame"], SessionTableCanvas):
+            info["table_frame"].set_running_duration(running_str)
 
     def _update_task_ui(self, task):
         """Update the entire UI for a single task."""
@@ -669,7 +852,7 @@ class PyChronApp(ctk.CTk):
         if task.timer_active:
             info["pause_button"].configure(text="Pause")
         else:
-            info["pause_button"].configure(text="Resume" if task.timings else "Start")
+            info["pause_button"].configure(text="Resume" if task.session_count else "Start")
 
         # Timings table: build/update grid-style table
         # (Session | Start | End | Duration)
@@ -677,6 +860,8 @@ class PyChronApp(ctk.CTk):
         table_rows = info.get("table_rows", [])
         current_row = info.get("current_row")
         collapsed = info.get("collapsed", False)
+        if not collapsed and table_frame is None:
+            table_frame = self._build_session_table(info)
 
         # show/hide table_frame based on collapsed state
         if table_frame:
@@ -691,8 +876,14 @@ class PyChronApp(ctk.CTk):
                 except Exception:
                     pass
 
+        # Collapsed tables are filled in when expanded, so lazily loaded
+        # tasks keep their timings on disk until then.
         # If there are no timings and not running, keep only header (no rows)
-        if not task.timings and not task.timer_active:
+        if collapsed:
+            pass
+        elif isinstance(table_frame, SessionTableCanvas):
+            self._update_session_canvas(task, table_frame)
+        elif not task.session_count and not task.timer_active:
             # destroy any existing data rows
             for row in table_rows:
                 for cell in row:
@@ -710,218 +901,19 @@ class PyChronApp(ctk.CTk):
                         pass
                 info["current_row"] = None
         else:
-            # rebuild rows if count mismatch
-            if len(table_rows) != len(task.timings):
-                # clear old rows
-                for row in table_rows:
-                    for cell in row:
-                        try:
-                            cell.destroy()
-                        except Exception:
-                            pass
-                table_rows = []
-                for i, entry in enumerate(task.timings):
-                    start_dt = datetime.fromisoformat(entry["start"])
-                    end_dt = datetime.fromisoformat(entry["end"])
-                    start = start_dt.strftime("%H:%M:%S")
-                    end = end_dt.strftime("%H:%M:%S")
-                    dur_str = format_timedelta(end_dt - start_dt)
-                    # Use theme-appropriate colors for table rows
-                    container_bg = self._get_container_bg()
-                    text_color = (
-                        "#000000" if self.current_theme == "Light" else "#FFFFFF"
-                    )
-                    # Use custom session name if available
-                    session_name = entry.get("name") or f"Session {i + 1}"
-                    # Session name frame to hold pencil icon and name
-                    session_frame = ctk.CTkFrame(table_frame, fg_color=container_bg)
-                    # Pencil icon button for editing session name - more visible
-                    light_fg = "#E0E0E0"
-                    dark_fg = "#555555"
-                    light_hover = "#BDBDBD"
-                    dark_hover = "#777777"
-                    light_text = "#000000"
-                    dark_text = "#FFFFFF"
-                    edit_icon_btn = ctk.CTkButton(
-                        session_frame,
-                        text="✏",
-                        width=28,
-                        height=22,
-                        fg_color=(
-                            light_fg
-                            if self.current_theme == "Light"
-                            else dark_fg
-                        ),
-                        hover_color=(
-                            light_hover
-                            if self.current_theme == "Light"
-                            else dark_hover
-                        ),
-                        text_color=(
-                            light_text
-                            if self.current_theme == "Light"
-                            else dark_text
-                        ),
-                        command=lambda t=task, idx=i: self.handlers.edit_session_name(
-                            t, idx
-                        ),
-                        font=ctk.CTkFont(size=14, weight="bold"),
-                    )
-                    edit_icon_btn.pack(side="left", padx=(2, 4))
-                    # Session name label
-                    lbl_session = ctk.CTkLabel(
-                        session_frame,
-                        text=session_name,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    lbl_session.pack(side="left", padx=0)
-                    lbl_start = ctk.CTkLabel(
-                        table_frame,
-                        text=start,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    lbl_end = ctk.CTkLabel(
-                        table_frame,
-                        text=end,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    lbl_dur = ctk.CTkLabel(
-                        table_frame,
-                        text=dur_str,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    # Action buttons frame - only note button now
-                    actions_frame = ctk.CTkFrame(table_frame, fg_color=container_bg)
-                    # Note button - muted yellow, narrower to fit header
-                    has_note = bool(entry.get("note"))
-                    note_btn = ctk.CTkButton(
-                        actions_frame,
-                        text="Note" if has_note else "Add Note",
-                        width=70,
-                        height=24,
-                        fg_color="#F9A825" if has_note else "#F5F5DC",
-                        hover_color="#F57F17" if has_note else "#E8E8D3",
-                        text_color="#000000",
-                        command=lambda t=task, idx=i: self.handlers.edit_session_note(
-                            t, idx
-                        ),
-                        font=ctk.CTkFont(size=9),
-                    )
-                    note_btn.pack(side="left", padx=2)
-
-                    session_frame.grid(row=i + 1, column=0, sticky="ew", padx=6, pady=2)
-                    lbl_start.grid(row=i + 1, column=1, sticky="ew", padx=6, pady=2)
-                    lbl_end.grid(row=i + 1, column=2, sticky="ew", padx=6, pady=2)
-                    lbl_dur.grid(row=i + 1, column=3, sticky="ew", padx=6, pady=2)
-                    actions_frame.grid(
-                        row=i + 1, column=4, sticky="ew", padx=2, pady=2
-                    )
-                    table_rows.append(
-                        [session_frame, lbl_start, lbl_end, lbl_dur, actions_frame]
-                    )
-                info["table_rows"] = table_rows
-            else:
-                # update existing rows texts
-                for i, entry in enumerate(task.timings):
-                    start_dt = datetime.fromisoformat(entry["start"])
-                    end_dt = datetime.fromisoformat(entry["end"])
-                    start = start_dt.strftime("%H:%M:%S")
-                    end = end_dt.strftime("%H:%M:%S")
-                    dur_str = format_timedelta(end_dt - start_dt)
-                    row = table_rows[i]
+            # Session rows are keyed by index: drop rows for sessions that
+            # no longer exist and append rows for new ones. Existing rows
+            # are left alone; edits refresh their row via _update_session_row.
+            timings = task.timings
+            while len(table_rows) > len(timings):
+                for cell in table_rows.pop():
                     try:
-                        # Update colors when theme changes
-                        container_bg = self._get_container_bg()
-                        text_color = (
-                            "#000000"
-                            if self.current_theme == "Light"
-                            else "#FFFFFF"
-                        )
-                        # Update session name in frame
-                        if isinstance(row[0], ctk.CTkFrame):
-                            session_frame = row[0]
-                            # Update frame background
-                            session_frame.configure(fg_color=container_bg)
-                            # Update both the pencil icon button and label
-                            for widget in session_frame.winfo_children():
-                                if isinstance(widget, ctk.CTkLabel):
-                                    session_name = (
-                                        entry.get("name") or f"Session {i + 1}"
-                                    )
-                                    widget.configure(
-                                        text=session_name,
-                                        fg_color=container_bg,
-                                        text_color=text_color,
-                                    )
-                                elif isinstance(widget, ctk.CTkButton):
-                                    # Update pencil icon button colors for theme
-                                    light_fg = "#E0E0E0"
-                                    dark_fg = "#555555"
-                                    light_hover = "#BDBDBD"
-                                    dark_hover = "#777777"
-                                    light_text = "#000000"
-                                    dark_text = "#FFFFFF"
-                                    widget.configure(
-                                        fg_color=(
-                                            light_fg
-                                            if self.current_theme == "Light"
-                                            else dark_fg
-                                        ),
-                                        hover_color=(
-                                            light_hover
-                                            if self.current_theme == "Light"
-                                            else dark_hover
-                                        ),
-                                        text_color=(
-                                            light_text
-                                            if self.current_theme == "Light"
-                                            else dark_text
-                                        ),
-                                    )
-                        # Update action buttons if they exist
-                        if (
-                            len(row) > ACTIONS_FRAME_INDEX
-                            and isinstance(row[ACTIONS_FRAME_INDEX], ctk.CTkFrame)
-                        ):
-                            actions_frame = row[ACTIONS_FRAME_INDEX]
-                            # Update frame background
-                            actions_frame.configure(fg_color=container_bg)
-                            # Update note button
-                            buttons = [
-                                w
-                                for w in actions_frame.winfo_children()
-                                if isinstance(w, ctk.CTkButton)
-                            ]
-                            if len(buttons) >= 1:
-                                note_btn = buttons[0]
-                                has_note = bool(entry.get("note"))
-                                note_btn.configure(
-                                    text="Note" if has_note else "Add Note",
-                                    fg_color="#F9A825" if has_note else "#F5F5DC",
-                                    hover_color="#F57F17" if has_note else "#E8E8D3",
-                                    text_color="#000000",
-                                )
-                        row[1].configure(
-                            text=start,
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
-                        row[2].configure(
-                            text=end,
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
-                        row[3].configure(
-                            text=dur_str,
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
+                        cell.destroy()
                     except Exception:
                         pass
+            for i in range(len(table_rows), len(timings)):
+                table_rows.append(self._create_session_row(info, task, i, timings[i]))
+            info["table_rows"] = table_rows
 
             # handle running current session row (last)
             if task.timer_active and task.current_start_time:
@@ -931,67 +923,25 @@ class PyChronApp(ctk.CTk):
                 r = len(task.timings) + 1
                 if current_row:
                     try:
-                        # Update colors when theme changes
-                        container_bg = self._get_container_bg()
-                        text_color = (
-                            "#000000"
-                            if self.current_theme == "Light"
-                            else "#FFFFFF"
-                        )
-                        current_row[0].configure(
-                            text=f"Session {r}",
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
-                        current_row[1].configure(
-                            text=start,
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
-                        current_row[2].configure(
-                            text="(running)",
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
-                        current_row[3].configure(
-                            text=running_str,
-                            fg_color=container_bg,
-                            text_color=text_color,
-                        )
+                        current_row[0].configure(text=f"Session {r}")
+                        current_row[1].configure(text=start)
+                        current_row[2].configure(text="(running)")
+                        current_row[3].configure(text=running_str)
                     except Exception:
                         pass
                 else:
+                    cr0 = ctk.CTkLabel(table_frame, text=f"Session {r}")
+                    cr1 = ctk.CTkLabel(table_frame, text=start)
+                    cr2 = ctk.CTkLabel(table_frame, text="(running)")
+                    cr3 = ctk.CTkLabel(table_frame, text=running_str)
                     # Use theme-appropriate colors for running row
-                    container_bg = self._get_container_bg()
-                    text_color = (
-                        "#000000"
-                        if self.current_theme == "Light"
-                        else "#FFFFFF"
-                    )
-                    cr0 = ctk.CTkLabel(
-                        table_frame,
-                        text=f"Session {r}",
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    cr1 = ctk.CTkLabel(
-                        table_frame,
-                        text=start,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    cr2 = ctk.CTkLabel(
-                        table_frame,
-                        text="(running)",
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
-                    cr3 = ctk.CTkLabel(
-                        table_frame,
-                        text=running_str,
-                        fg_color=container_bg,
-                        text_color=text_color,
-                    )
+                    for cell in (cr0, cr1, cr2, cr3):
+                        self.styles.subscribe(
+                            cell,
+                            info["style_group"],
+                            fg_color="container_bg",
+                            text_color="text",
+                        )
                     cr0.grid(row=r, column=0, sticky="ew", padx=6, pady=2)
                     cr1.grid(row=r, column=1, sticky="ew", padx=6, pady=2)
                     cr2.grid(row=r, column=2, sticky="ew", padx=6, pady=2)
@@ -1010,30 +960,19 @@ class PyChronApp(ctk.CTk):
         if task.status == "Completed":
             # green border for completed
             try:
-                fg = self._get_container_bg()
-                info["frame"].configure(
-                    border_width=2, border_color="#4CAF50", fg_color=fg
-                )
-                info["timings_frame"].configure(fg_color=fg)
+                info["frame"].configure(border_width=2, border_color="#4CAF50")
             except Exception:
                 # fallback if border properties not supported
-                fg = self._get_container_bg()
-                info["frame"].configure(fg_color=fg)
-                info["timings_frame"].configure(fg_color=fg)
+                pass
 
             info["pause_button"].configure(state="disabled", text="Completed")
             info["complete_button"].configure(state="normal", text="Undo Completion")
         else:
             # yellow border for active/non-complete
             try:
-                fg = self._get_container_bg()
-                info["frame"].configure(
-                    border_width=2, border_color="#FFB300", fg_color=fg
-                )
-                info["timings_frame"].configure(fg_color=fg)
+                info["frame"].configure(border_width=2, border_color="#FFB300")
             except Exception:
-                info["frame"].configure(fg_color=fg)
-                info["timings_frame"].configure(fg_color=fg)
+                pass
 
             # ensure buttons are enabled
             info["pause_button"].configure(state="normal")
@@ -1042,17 +981,113 @@ class PyChronApp(ctk.CTk):
         # Update task note button indicator
         if "note_button" in info:
             has_note = bool(task.note)
-            # Only update text_color if we need to change it
-            config_dict = {
-                "text": "Note" if has_note else "Add Note",
-                "fg_color": "#F9A825" if has_note else "#F5F5DC",
-                "hover_color": "#F57F17" if has_note else "#E8E8D3",
-                "text_color": "#000000",
-            }
-            info["note_button"].configure(**config_dict)
+            info["note_button"].configure(
+                text="Note" if has_note else "Add Note",
+                **self.styles.note_button_options(has_note),
+            )
 
         # Update scrollbar visibility after UI changes (new rows, etc.)
-        self.after(10, self._update_scrollbar_visibility)
+        self._update_scrollbar_visibility()
+
+    def _create_session_row(self, info, task, i, session):
+        """Build and grid the widgets for session i in a row's table.
+
+        Returns:
+            List of the row's cells (session frame, start, end, duration,
+            actions frame)
+        """
+        table_frame = info["table_frame"]
+        group = info["style_group"]
+        start = session.start.strftime("%H:%M:%S")
+        end = session.end.strftime("%H:%M:%S")
+        dur_str = format_timedelta(session.duration)
+        # Use custom session name if available
+        session_name = session.display_name(i)
+        # Session name frame to hold pencil icon and name
+        session_frame = ctk.CTkFrame(table_frame)
+        # Pencil icon button for editing session name - more visible
+        edit_icon_btn = ctk.CTkButton(
+            session_frame,
+            text="✏",
+            width=28,
+            height=22,
+            command=lambda t=task, idx=i: self.handlers.edit_session_name(t, idx),
+            font=ctk.CTkFont(size=14, weight="bold"),
+        )
+        self.styles.subscribe(
+            edit_icon_btn,
+            group,
+            fg_color="pencil_bg",
+            hover_color="pencil_hover",
+            text_color="pencil_text",
+        )
+        edit_icon_btn.pack(side="left", padx=(2, 4))
+        # Session name label
+        lbl_session = ctk.CTkLabel(session_frame, text=session_name)
+        lbl_session.pack(side="left", padx=0)
+        lbl_start = ctk.CTkLabel(table_frame, text=start)
+        lbl_end = ctk.CTkLabel(table_frame, text=end)
+        lbl_dur = ctk.CTkLabel(table_frame, text=dur_str)
+        # Action buttons frame - only note button now
+        actions_frame = ctk.CTkFrame(table_frame)
+        # Note button - muted yellow, narrower to fit header
+        has_note = bool(session.note)
+        note_btn = ctk.CTkButton(
+            actions_frame,
+            text="Note" if has_note else "Add Note",
+            width=70,
+            height=24,
+            command=lambda t=task, idx=i: self.handlers.edit_session_note(t, idx),
+            font=ctk.CTkFont(size=9),
+            **self.styles.note_button_options(has_note),
+        )
+        note_btn.pack(side="left", padx=2)
+
+        # Use theme-appropriate colors for table rows
+        for widget in (session_frame, actions_frame):
+            self.styles.subscribe(widget, group, fg_color="container_bg")
+        for label in (lbl_session, lbl_start, lbl_end, lbl_dur):
+            self.styles.subscribe(label, group, fg_color="container_bg", text_color="text")
+
+        session_frame.grid(row=i + 1, column=0, sticky="ew", padx=6, pady=2)
+        lbl_start.grid(row=i + 1, column=1, sticky="ew", padx=6, pady=2)
+        lbl_end.grid(row=i + 1, column=2, sticky="ew", padx=6, pady=2)
+        lbl_dur.grid(row=i + 1, column=3, sticky="ew", padx=6, pady=2)
+        actions_frame.grid(row=i + 1, column=4, sticky="ew", padx=2, pady=2)
+        return [session_frame, lbl_start, lbl_end, lbl_dur, actions_frame]
+
+    def _update_session_row(self, task, i):
+        """Refresh the table row for session i after it was edited."""
+        info = self.task_frames.get(task.name)
+        if not info:
+            return
+        table = info.get("table_frame")
+        if isinstance(table, SessionTableCanvas):
+            if i < table.row_count:
+                table.update_row(i, *self._session_cells(i, task.timings[i]))
+            return
+        if i >= len(info.get("table_rows", [])):
+            return
+        row = info["table_rows"][i]
+        session = task.timings[i]
+        try:
+            # Update session name label next to the pencil icon
+            for widget in row[0].winfo_children():
+                if isinstance(widget, ctk.CTkLabel):
+                    widget.configure(text=session.display_name(i))
+            # Update note button
+            for widget in row[ACTIONS_FRAME_INDEX].winfo_children():
+                if isinstance(widget, ctk.CTkButton):
+                    has_note = bool(session.note)
+                    widget.configure(
+                        text="Note" if has_note else "Add Note",
+                        **self.styles.note_button_options(has_note),
+                    )
+            row[1].configure(text=session.start.strftime("%H:%M:%S"))
+            row[2].configure(text=session.end.strftime("%H:%M:%S"))
+            row[3].configure(text=format_timedelta(session.duration))
+        except Exception:
+            pass
 
     def _set_window_icon(self):
         """Set the window icon to match Tkinterviz or use a default."""
@@ -1063,9 +1098,7 @@ class PyChronApp(ctk.CTk):
 
                 # Use a unique ID for this application
                 app_id = "com.pychron.app.1.0"
-                ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
-                    app_id
-                )
+                ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(app_id)
             except Exception:
                 pass
 
@@ -1113,10 +1146,21 @@ class PyChronApp(ctk.CTk):
             pass
 
     def _on_closing(self):
-        save_tasks(self.tasks)
+        # Flush any debounced changes before folding them into the data file
+        if not self.autosave.close():
+            stats = self.autosave.stats()
+            reason = stats["last_error"] or "Saving did not finish in time."
+            show_error(
+                self,
+                "Save Error",
+                f"{stats['pending']} change(s) could not be saved and will be lost:\n{reason}",
+            )
+        compact_storage()
         self.destroy()
 
 
 if __name__ == "__main__":
+    # Autosave statistics and write failures are logged to the console
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
     app = PyChronApp()
     app.mainloop()
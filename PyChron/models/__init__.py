@@ -1,5 +1,6 @@
 """Task model module."""
 
+from .session import Session
 from .task import Task
 
-__all__ = ["Task"]
+__all__ = ["Session", "Task"]
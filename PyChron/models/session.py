@@ -0,0 +1,85 @@
+"""Session data model."""
+
+from datetime import datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(dt):
+    """Convert a naive local datetime to integer microseconds since 1970-01-01."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - _EPOCH) // _ONE_MICROSECOND
+
+
+def from_epoch_us(us):
+    """Convert integer microseconds since 1970-01-01 to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=us)
+
+
+class Session:
+    """A single closed work session on a task.
+
+    Start and end are stored as integer microseconds since 1970-01-01 (naive
+    local time, matching the timestamps written by datetime.now()), so
+    durations are plain integer arithmetic. Datetimes and display strings
+    are derived on demand.
+    """
+
+    __slots__ = ("end_us", "name", "note", "start_us")
+
+    def __init__(self, start_us, end_us, name=None, note=None):
+        self.start_us = start_us
+        self.end_us = end_us
+        self.name = name  # Custom session name (None = use default)
+        self.note = note  # Session note
+
+    @classmethod
+    def from_datetimes(cls, start, end, name=None, note=None):
+        return cls(to_epoch_us(start), to_epoch_us(end), name, note)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a session from a {'start', 'end', 'name', 'note'} dictionary."""
+        return cls(
+            to_epoch_us(datetime.fromisoformat(data["start"])),
+            to_epoch_us(datetime.fromisoformat(data["end"])),
+            data.get("name"),
+            data.get("note"),
+        )
+
+    def to_dict(self):
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "name": self.name,
+            "note": self.note,
+        }
+
+    @property
+    def start(self):
+        return from_epoch_us(self.start_us)
+
+    @property
+    def end(self):
+        return from_epoch_us(self.end_us)
+
+    @property
+    def seconds(self):
+        """Duration truncated to whole seconds."""
+        return int((self.end_us - self.start_us) / 1_000_000)
+
+    @property
+    def duration(self):
+        return timedelta(seconds=self.seconds)
+
+    def display_name(self, index):
+        """Return the custom name, or the default "Session N" for this index."""
+        return self.name or f"Session {index + 1}"
+
+    def __repr__(self):
+        return (
+            f"Session(start={self.start.isoformat()!r}, end={self.end.isoformat()!r}, "
+            f"name={self.name!r}, note={self.note!r})"
+        )
@@ -1,37 +1,211 @@
 """Task data model."""
 
+from bisect import bisect_left
 from datetime import datetime, timedelta
 
+from .session import Session, from_epoch_us
+
+
+def _sessions_from_dicts(timings):
+    """Convert stored timing dictionaries into Session objects.
+
+    Old entries without name and note fields get None for both.
+    """
+    return [Session.from_dict(entry) for entry in timings]
+
 
 class Task:
-    """Represents a single task with its timing records."""
+    """Represents a single task with its timing records.
+
+    The total of closed session durations is cached and kept up to date by
+    add_session, update_session and remove_session, so get_total_duration
+    does not walk the session list. Mutate sessions through those methods
+    (changing a session's name or note directly is fine).
+    """
+
+    # When True, every get_total_duration call verifies the cached total
+    # against a full recompute (slow; meant for debugging and tests)
+    CHECK_INVARIANTS = False
 
     def __init__(self, name, timings=None, status="In Progress", note=None):
         self.name = name
-        # List of {'start': str, 'end': str, 'name': str, 'note': str}
-        self.timings = timings if timings else []
+        # List of Session objects
+        self._timings = timings if timings else []
         self.status = status
         self.note = note  # Task-level note
         self.timer_active = False
         self.current_start_time = None
+        # Sum of closed session durations in whole seconds
+        self._closed_seconds = sum(session.seconds for session in self._timings)
+        # Lazy stubs: timings are read from disk by _loader on first access
+        self._loader = None
+        self._range_loader = None
+        self._summary_count = 0
+        # (sorted start times, session indexes) for range lookups, built on
+        # first use and dropped whenever sessions change
+        self._start_index = None
+
+    @classmethod
+    def from_summary(
+        cls, name, status, note, total_seconds, session_count, loader, range_loader=None
+    ):
+        """Create a lightweight stub whose timings are loaded on first access.
+
+        Args:
+            name: Task name
+            status: Task status
+            note: Task-level note
+            total_seconds: Cached total duration of all sessions
+            session_count: Cached number of sessions
+            loader: Callable taking the task and returning its timing
+                dictionaries
+            range_loader: Optional callable taking (task, start, end) with
+                ISO-8601 bounds and yielding (index, timing dictionary) for
+                the sessions starting in [start, end), for backends that can
+                filter by start time themselves
+        """
+        task = cls(name, None, status, note)
+        task._timings = None
+        task._loader = loader
+        task._range_loader = range_loader
+        task._closed_seconds = total_seconds
+        task._summary_count = session_count
+        return task
+
+    @property
+    def is_loaded(self):
+        """True once the task's timings are in memory."""
+        return self._timings is not None
+
+    @property
+    def timings(self):
+        if self._timings is None:
+            self._timings = _sessions_from_dicts(self._loader(self))
+            self._loader = None
+            self._range_loader = None
+        return self._timings
+
+    @timings.setter
+    def timings(self, value):
+        self._timings = value
+        self._loader = None
+        self._range_loader = None
+        self._start_index = None
+        self._closed_seconds = sum(session.seconds for session in value)
+
+    def iter_sessions(self):
+        """Yield the task's sessions without keeping a stub's sessions loaded.
+
+        Loaded tasks yield their Session objects. Stubs read their sessions
+        from disk and yield them one at a time, leaving the stub unloaded
+        so exporting many completed tasks does not pull them all into memory.
+        """
+        if self._timings is not None:
+            yield from self._timings
+            return
+        for entry in self._loader(self):
+            yield Session.from_dict(entry)
+
+    def iter_sessions_between(self, start_us=None, end_us=None):
+        """Yield (index, session) for sessions starting in [start_us, end_us).
+
+        Loaded tasks look the range up in a start-time index, so sessions
+        outside it are never visited. Stubs with a range loader (SQLite)
+        leave the filtering to it; others compare the stored ISO start
+        strings (which sort like the times they hold) and only parse the
+        sessions in range. Sessions are yielded in their recorded order.
+
+        Args:
+            start_us: Inclusive lower bound in epoch microseconds, or None
+            end_us: Exclusive upper bound in epoch microseconds, or None
+        """
+        if self._timings is None:
+            low = None if start_us is None else from_epoch_us(start_us).isoformat()
+            high = None if end_us is None else from_epoch_us(end_us).isoformat()
+            if self._range_loader is not None:
+                for i, entry in self._range_loader(self, low, high):
+                    yield i, Session.from_dict(entry)
+                return
+            for i, entry in enumerate(self._loader(self)):
+                start = entry["start"]
+                if start[10:11] != "T":
+                    # Not in isoformat()'s layout, so normalize it first
+                    start = datetime.fromisoformat(start).isoformat()
+                if (low is not None and start < low) or (high is not None and start >= high):
+                    continue
+                yield i, Session.from_dict(entry)
+            return
+
+        if self._start_index is None:
+            order = sorted(range(len(self._timings)), key=lambda i: self._timings[i].start_us)
+            self._start_index = ([self._timings[i].start_us for i in order], order)
+        starts, order = self._start_index
+        lo = 0 if start_us is None else bisect_left(starts, start_us)
+        hi = len(starts) if end_us is None else bisect_left(starts, end_us)
+        for i in sorted(order[lo:hi]):
+            yield i, self._timings[i]
+
+    @property
+    def session_count(self):
+        """Number of recorded sessions, without loading a stub's timings."""
+        if self._timings is None:
+            return self._summary_count
+        return len(self._timings)
 
     def start_pause_timer(self):
         """Toggles the timer on and off (starts, pauses, resumes)."""
         if self.timer_active:  # Pause the timer
-            self.timings.append(
-                {
-                    "start": self.current_start_time.isoformat(),
-                    "end": datetime.now().isoformat(),
-                    "name": None,  # Custom session name (None = use default)
-                    "note": None,  # Session note
-                }
-            )
+            self.add_session(Session.from_datetimes(self.current_start_time, datetime.now()))
             self.timer_active = False
             self.current_start_time = None
         else:  # Start or resume the timer
             self.timer_active = True
             self.current_start_time = datetime.now()
 
+    def add_session(self, session):
+        """Append a closed session and add its duration to the cached total."""
+        self.timings.append(session)
+        self._closed_seconds += session.seconds
+        self._start_index = None
+
+    def update_session(self, index, **fields):
+        """Update attributes of the session at index, keeping the total in sync.
+
+        Args:
+            index: Position of the session in timings
+            **fields: Session attributes to set (start_us, end_us, name, note)
+        """
+        session = self.timings[index]
+        before = session.seconds
+        for key, value in fields.items():
+            setattr(session, key, value)
+        self._closed_seconds += session.seconds - before
+        if "start_us" in fields:
+            self._start_index = None
+
+    def remove_session(self, index):
+        """Remove the session at index and subtract its duration."""
+        session = self.timings.pop(index)
+        self._closed_seconds -= session.seconds
+        self._start_index = None
+        return session
+
+    def verify_total(self):
+        """Check the cached total against a full recompute.
+
+        Raises:
+            AssertionError: If the cache has drifted from the session list
+        """
+        if self._timings is None:
+            return
+        expected = sum(session.seconds for session in self._timings)
+        # Raised explicitly so the check still runs under python -O
+        if self._closed_seconds != expected:
+            raise AssertionError(
+                f"Task {self.name!r}: cached total {self._closed_seconds}s "
+                f"!= recomputed {expected}s"
+            )
+
     def complete_task(self):
         """Marks the task as completed and stops any active timer."""
         if self.timer_active:
@@ -45,13 +219,10 @@ class Task:
 
     def get_total_duration(self):
         """Get total duration as sum of rounded individual session durations."""
-        total_seconds = 0
-        for entry in self.timings:
-            start = datetime.fromisoformat(entry["start"])
-            end = datetime.fromisoformat(entry["end"])
-            # Round each session duration to whole seconds before summing
-            session_seconds = int((end - start).total_seconds())
-            total_seconds += session_seconds
+        if self.CHECK_INVARIANTS:
+            self.verify_total()
+        # Each closed session is already rounded to whole seconds
+        total_seconds = self._closed_seconds
 
         if self.timer_active and self.current_start_time:
             # Round current running session to whole seconds
@@ -64,7 +235,7 @@ class Task:
     def to_dict(self):
         return {
             "name": self.name,
-            "timings": self.timings,
+            "timings": [session.to_dict() for session in self.timings],
             "status": self.status,
             "note": self.note,
         }
@@ -72,13 +243,7 @@ class Task:
     @classmethod
     def from_dict(cls, data):
         # Ensure old data format is compatible
-        timings = data.get("timings", [])
-        # Migrate old timing entries to include name and note fields
-        for entry in timings:
-            if "name" not in entry:
-                entry["name"] = None
-            if "note" not in entry:
-                entry["note"] = None
+        timings = _sessions_from_dicts(data.get("timings", []))
         return cls(
             data["name"],
             timings,
@@ -1,5 +1,21 @@
 """Storage module for saving and loading tasks."""
 
-from .storage import load_tasks, save_tasks
+from .autosave import AutosaveWriter
+from .storage import (
+    compact_storage,
+    load_tasks,
+    load_tasks_async,
+    record_change,
+    record_changes,
+    save_tasks,
+)
 
-__all__ = ["load_tasks", "save_tasks"]
+__all__ = [
+    "AutosaveWriter",
+    "compact_storage",
+    "load_tasks",
+    "load_tasks_async",
+    "record_change",
+    "record_changes",
+    "save_tasks",
+]
@@ -0,0 +1,256 @@
+"""Background autosave writer that coalesces bursts of task changes."""
+
+import copy
+import logging
+import threading
+import time
+
+from constants import AUTOSAVE_DEBOUNCE_MS, AUTOSAVE_MAX_DELAY_MS, AUTOSAVE_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class AutosaveWriter:
+    """Debounces change records and writes them on a worker thread.
+
+    Changes submitted from the Tk thread are deep-copied into immutable
+    records, so the worker never touches live Task state. A burst of changes
+    arriving within AUTOSAVE_DEBOUNCE_MS of each other is written as a single
+    batch, but no change waits longer than AUTOSAVE_MAX_DELAY_MS.
+
+    A failed batch is retried. After AUTOSAVE_MAX_RETRIES failures its
+    records are written one at a time, and the first record that still fails
+    is skipped so it cannot block the changes behind it; take_skipped
+    returns the skipped records. write_batch must write a batch completely
+    or not at all, so a retry never writes a record twice.
+    """
+
+    def __init__(
+        self,
+        write_batch,
+        debounce_ms=AUTOSAVE_DEBOUNCE_MS,
+        max_delay_ms=AUTOSAVE_MAX_DELAY_MS,
+        max_retries=AUTOSAVE_MAX_RETRIES,
+    ):
+        """Start the writer thread.
+
+        Args:
+            write_batch: Function called with a list of change records
+            debounce_ms: Quiet period after the last change before writing
+            max_delay_ms: Upper bound on how long a change may stay pending
+            max_retries: Failed attempts before the failing record is skipped
+        """
+        self._write_batch = write_batch
+        self._debounce = debounce_ms / 1000.0
+        self._max_delay = max_delay_ms / 1000.0
+        self._max_retries = max_retries
+        self._failures = 0  # Consecutive failed writes
+        self._skipped = []  # (record, error message) not yet taken
+        self._cond = threading.Condition()
+        self._pending = []
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+
+        # Statistics
+        self.changes = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        self.last_error = None
+        self.skipped = 0
+
+        self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def dirty(self):
+        """True while changes are pending or being written."""
+        with self._cond:
+            return bool(self._pending) or self._writing
+
+    def submit(self, op, **fields):
+        """Queue a change record for the next write.
+
+        Args:
+            op: Operation name (see storage.record_change)
+            **fields: Operation fields; copied so later edits do not leak in
+        """
+        record = copy.deepcopy(fields)
+        record["op"] = op
+        now = time.monotonic()
+        with self._cond:
+            if not self._pending:
+                self._first_change = now
+            self._pending.append(record)
+            self._last_change = now
+            self.changes += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Write pending changes now and wait for them to reach disk.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            bool: True if everything was written
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            try:
+                while self._pending or self._writing:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flush_requested = False
+
+    def close(self, timeout=5.0):
+        """Flush pending changes, stop the writer thread and log its statistics.
+
+        Returns:
+            bool: True if everything was written before the timeout
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        stats = self.stats()
+        logger.info(
+            "Autosave: %d changes in %d writes (%d coalesced), "
+            "last write %.1f ms, slowest %.1f ms, %d pending",
+            stats["changes"],
+            stats["writes"],
+            stats["coalesced"],
+            stats["last_write_ms"],
+            stats["max_write_ms"],
+            stats["pending"],
+        )
+        return flushed
+
+    def stats(self):
+        """Return a dictionary of write statistics."""
+        with self._cond:
+            return {
+                "changes": self.changes,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "pending": len(self._pending),
+                "last_write_ms": self.last_write_ms,
+                "max_write_ms": self.max_write_ms,
+                "last_error": self.last_error,
+                "skipped": self.skipped,
+            }
+
+    def take_skipped(self):
+        """Return and forget the (record, error message) pairs skipped so far."""
+        with self._cond:
+            skipped = self._skipped
+            self._skipped = []
+            return skipped
+
+    def _wait_for_batch(self):
+        """Block until a batch is due and take it. Returns None on shutdown."""
+        with self._cond:
+            while True:
+                if self._pending:
+                    if self._flush_requested or self._closed:
+                        break
+                    now = time.monotonic()
+                    due = min(
+                        self._last_change + self._debounce,
+                        self._first_change + self._max_delay,
+                    )
+                    if now >= due:
+                        break
+                    self._cond.wait(due - now)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+            batch = self._pending
+            self._pending = []
+            self._writing = True
+            return batch
+
+    def _write_one_by_one(self, batch):
+        """Write batch record by record, stopping at the first failure.
+
+        Returns:
+            Tuple (written, error): the number of records written and the
+            exception the next record raised, or None if all were written
+        """
+        for written, record in enumerate(batch):
+            try:
+                self._write_batch([record])
+            except Exception as e:
+                return written, e
+        return len(batch), None
+
+    def _run(self):
+        while True:
+            batch = self._wait_for_batch()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            error = None
+            if self._failures >= self._max_retries:
+                # Find the record that keeps failing and skip it
+                written, error = self._write_one_by_one(batch)
+            else:
+                written = len(batch)
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    written, error = 0, e
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            skipped = None
+            with self._cond:
+                self._writing = False
+                if error is None:
+                    self.writes += 1
+                    self.coalesced += len(batch) - 1
+                    self.last_write_ms = elapsed_ms
+                    self.max_write_ms = max(self.max_write_ms, elapsed_ms)
+                    self.last_error = None
+                    self._failures = 0
+                elif self._failures >= self._max_retries:
+                    # One-by-one pass: give up on the failing record and
+                    # retry the ones behind it normally
+                    skipped = batch[written]
+                    self._skipped.append((skipped, str(error)))
+                    self.skipped += 1
+                    self.last_error = str(error)
+                    self._failures = 0
+                    self._pending = batch[written + 1 :] + self._pending
+                else:
+                    # Keep the records so the next attempt writes them again
+                    if str(error) != self.last_error:
+                        # Log each new failure once, not every retry
+                        logger.warning("Autosave write failed: %s", error)
+                    self.last_error = str(error)
+                    self._failures += 1
+                    self._pending = batch + self._pending
+                    self._first_change = self._last_change = time.monotonic()
+                closed = self._closed
+                self._cond.notify_all()
+            if skipped is not None:
+                logger.error(
+                    "Autosave skipped a change that cannot be saved: %s (%s)",
+                    skipped.get("op"),
+                    error,
+                )
+            elif error is not None:
+                if closed:
+                    return
+                # Back off before retrying, even if a flush is waiting
+                time.sleep(self._debounce)
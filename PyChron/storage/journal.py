@@ -0,0 +1,539 @@
+"""Append-only change journal layered on top of the JSON snapshot.
+
+Every task mutation is appended to JOURNAL_FILE as one JSON line, so a save
+costs the same no matter how much history DATA_FILE holds. Once the journal
+grows past JOURNAL_COMPACT_THRESHOLD records, a background thread folds it
+into a fresh snapshot.
+
+Compaction first renames the live journal to ``<JOURNAL_FILE>.compacting``
+and records a fingerprint of the snapshot it applies to in
+``<JOURNAL_FILE>.base``. On load, the compacting journal is only replayed
+while that fingerprint still matches DATA_FILE, so a crash between writing
+the new snapshot and removing the old journal never applies records twice.
+
+Every snapshot write also produces ``<DATA_FILE>.idx``, holding each task's
+byte range in DATA_FILE and its cached totals. With it, load_items(lazy=True)
+returns completed tasks as summaries and reads their timings on demand, finding
+them through the newest index after a compaction has rewritten DATA_FILE.
+"""
+
+import hashlib
+import json
+import os
+import textwrap
+import threading
+from datetime import datetime
+
+from constants import DATA_FILE, JOURNAL_COMPACT_THRESHOLD, JOURNAL_FILE
+
+COMPACTING_FILE = JOURNAL_FILE + ".compacting"
+BASE_FILE = JOURNAL_FILE + ".base"
+INDEX_FILE = DATA_FILE + ".idx"
+
+# Guards appends and journal rotation (held briefly)
+_journal_lock = threading.Lock()
+# Serializes snapshot rewrites (compaction and full saves)
+_snapshot_lock = threading.Lock()
+_live_records = 0
+_compaction_thread = None
+# Whether this run has cut a torn last line off the journal yet
+_journal_checked = False
+# (stat key, {task name: (offset, length)}) of the newest snapshot, so lazy
+# loaders can find their task again after a compaction rewrites DATA_FILE
+_current_index = None
+
+
+def _fingerprint(raw):
+    """Return a stable fingerprint for the raw bytes of a snapshot."""
+    return hashlib.sha1(raw).hexdigest() if raw else ""
+
+
+def _read_snapshot_bytes():
+    """Return the raw contents of DATA_FILE, or empty bytes if missing."""
+    try:
+        with open(DATA_FILE, "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def _parse_snapshot(raw):
+    """Parse snapshot bytes into a list of task dictionaries."""
+    if not raw:
+        return []
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def _session_seconds(entry):
+    """Return a raw timing entry's duration rounded down to whole seconds."""
+    try:
+        start = datetime.fromisoformat(entry["start"])
+        end = datetime.fromisoformat(entry["end"])
+    except (KeyError, TypeError, ValueError):
+        return 0
+    return int((end - start).total_seconds())
+
+
+def _write_snapshot(items):
+    """Atomically replace DATA_FILE with the given task dictionaries.
+
+    Also writes INDEX_FILE with each task's byte range and cached totals.
+    """
+    tmp_path = DATA_FILE + ".tmp"
+    index = []
+    with open(tmp_path, "wb") as f:
+        # Same layout as json.dump(items, f, indent=4), one task at a time
+        offset = f.write(b"[\n" if items else b"[]")
+        for i, item in enumerate(items):
+            if i:
+                offset += f.write(b",\n")
+            data = textwrap.indent(json.dumps(item, indent=4), "    ").encode("utf-8")
+            timings = item.get("timings", [])
+            index.append(
+                {
+                    "name": item.get("name"),
+                    "status": item.get("status", "In Progress"),
+                    "note": item.get("note"),
+                    "offset": offset,
+                    "length": len(data),
+                    "session_count": len(timings),
+                    "total_seconds": sum(_session_seconds(e) for e in timings),
+                }
+            )
+            offset += f.write(data)
+        if items:
+            f.write(b"\n]")
+        f.flush()
+        os.fsync(f.fileno())
+    st = os.stat(tmp_path)
+    os.replace(tmp_path, DATA_FILE)
+
+    # The index is only trusted while DATA_FILE still has this size and mtime
+    index_tmp = INDEX_FILE + ".tmp"
+    with open(index_tmp, "w") as f:
+        json.dump({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "tasks": index}, f)
+    os.replace(index_tmp, INDEX_FILE)
+    _publish_index((st.st_size, st.st_mtime_ns), index)
+
+
+def _publish_index(stat_key, entries):
+    """Make an index the one lazy loaders look tasks up in."""
+    global _current_index
+    _current_index = (
+        stat_key,
+        {entry["name"]: (entry["offset"], entry["length"]) for entry in entries},
+    )
+
+
+def _snapshot_stat():
+    try:
+        st = os.stat(DATA_FILE)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _read_index():
+    """Return the index entries if INDEX_FILE matches DATA_FILE, else None."""
+    try:
+        with open(INDEX_FILE, "r") as f:
+            index = json.load(f)
+        stat_key = (index["size"], index["mtime_ns"])
+        entries = index["tasks"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if stat_key != _snapshot_stat():
+        return None
+    return stat_key, entries
+
+
+def _locate(names):
+    """Find a task's byte range in the current DATA_FILE.
+
+    Uses the published index, re-reading INDEX_FILE if DATA_FILE has changed
+    since it was published.
+
+    Args:
+        names: Candidate task names, tried in order
+
+    Returns:
+        Tuple (stat_key, offset, length, name), or None if no index matches
+        DATA_FILE or none of the names is in it
+    """
+    current = _current_index
+    if current is None or current[0] != _snapshot_stat():
+        index = _read_index()
+        if index is None:
+            return None
+        _publish_index(*index)
+        current = _current_index
+    stat_key, ranges = current
+    for name in names:
+        if name in ranges:
+            return (stat_key, *ranges[name], name)
+    return None
+
+
+def _read_item(offset, length):
+    """Read and parse the task dictionary stored at a byte range of DATA_FILE."""
+    with open(DATA_FILE, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def _timings_loader(stat_key, offset, length, stored_name):
+    """Return a callable that reads one task's timings from the snapshot.
+
+    The callable takes the Task being materialized (or None). If DATA_FILE
+    has been rewritten since the index was read (e.g. by a compaction), it
+    looks the task up in the new index by its current name, then its stored
+    name, and remembers where it found it. Only a task missing from the
+    index falls back to a full load.
+    """
+    location = (stat_key, offset, length, stored_name)
+
+    def load(task=None):
+        nonlocal location
+        names = (getattr(task, "name", None), stored_name)
+        try:
+            if _snapshot_stat() != location[0]:
+                location = _locate(names) or location
+            if _snapshot_stat() == location[0]:
+                item = _read_item(location[1], location[2])
+                if item.get("name") == location[3]:
+                    return item.get("timings", [])
+        except (OSError, ValueError, AttributeError):
+            pass
+        items = {item["name"]: item for item in load_items()}
+        for name in (getattr(task, "name", None), stored_name):
+            if name in items:
+                return items[name].get("timings", [])
+        return []
+
+    return load
+
+
+def _items_from_index(stat_key, entries):
+    """Build task dictionaries from the index, reading only unfinished tasks.
+
+    Completed tasks become summaries with "total_seconds", "session_count"
+    and a "load_timings" callable instead of "timings".
+    """
+    items = []
+    with open(DATA_FILE, "rb") as f:
+        for entry in entries:
+            if entry["status"] == "Completed":
+                items.append(
+                    {
+                        "name": entry["name"],
+                        "status": entry["status"],
+                        "note": entry["note"],
+                        "total_seconds": entry["total_seconds"],
+                        "session_count": entry["session_count"],
+                        "load_timings": _timings_loader(
+                            stat_key, entry["offset"], entry["length"], entry["name"]
+                        ),
+                    }
+                )
+            else:
+                f.seek(entry["offset"])
+                items.append(json.loads(f.read(entry["length"]).decode("utf-8")))
+    return items
+
+
+def _materialize(item):
+    """Replace a summary item's cached totals with its loaded timings."""
+    if "timings" not in item and "load_timings" in item:
+        item["timings"] = item.pop("load_timings")(None)
+        item.pop("total_seconds", None)
+        item.pop("session_count", None)
+
+
+def _read_records(path):
+    """Read journal records from path, skipping lines that do not parse."""
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A partially written record from an interrupted save;
+                    # the records after it are still valid
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def _trim_torn_tail(path):
+    """Cut path back to its last newline, dropping a partially written record.
+
+    Without this, the next append would be glued onto the torn line and
+    lost with it. Must be called with _journal_lock held.
+    """
+    try:
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+    except OSError:
+        pass
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def apply_record(items, record):
+    """Apply one journal record to an ordered mapping of task dictionaries.
+
+    Args:
+        items: Dictionary of task name -> task dictionary (modified in place)
+        record: Journal record with an "op" key and op-specific fields
+    """
+    op = record.get("op")
+    name = record.get("name")
+    if op == "add_task":
+        items[name] = {
+            "name": name,
+            "timings": [],
+            "status": record.get("status", "In Progress"),
+            "note": record.get("note"),
+        }
+    elif op == "clear":
+        items.clear()
+    elif name not in items:
+        # Mutation for a task that no longer exists - nothing to replay
+        return
+    elif op == "update_task":
+        for key in ("status", "note"):
+            if key in record:
+                items[name][key] = record[key]
+    elif op == "rename_task":
+        new_name = record.get("new_name")
+        if not new_name or new_name in items:
+            return
+        renamed = {}
+        for key, item in items.items():
+            if key == name:
+                item["name"] = new_name
+                key = new_name
+            renamed[key] = item
+        items.clear()
+        items.update(renamed)
+    elif op == "delete_task":
+        del items[name]
+    elif op == "add_session":
+        _materialize(items[name])
+        items[name].setdefault("timings", []).append(dict(record["session"]))
+    elif op == "update_session":
+        _materialize(items[name])
+        timings = items[name].get("timings", [])
+        index = record.get("index", -1)
+        if 0 <= index < len(timings):
+            timings[index].update(record.get("fields", {}))
+
+
+def _replay(snapshot_items, records):
+    """Return the snapshot list with records applied, preserving task order."""
+    items = {}
+    for item in snapshot_items:
+        if isinstance(item, dict) and "name" in item:
+            items[item["name"]] = item
+    for record in records:
+        try:
+            apply_record(items, record)
+        except (KeyError, TypeError, AttributeError):
+            continue
+    return list(items.values())
+
+
+def _recover_compaction():
+    """Finish or discard a compaction left behind by an interrupted run.
+
+    Must be called with _snapshot_lock held.
+    """
+    if not os.path.exists(COMPACTING_FILE):
+        _remove(BASE_FILE)
+        return
+    raw = _read_snapshot_bytes()
+    try:
+        with open(BASE_FILE, "r") as f:
+            base = f.read().strip()
+    except OSError:
+        base = None
+    if base == _fingerprint(raw):
+        # Snapshot was never replaced - fold the pending records now
+        _write_snapshot(_replay(_parse_snapshot(raw), _read_records(COMPACTING_FILE)))
+    _remove(COMPACTING_FILE)
+    _remove(BASE_FILE)
+
+
+def _rotate_journal(raw):
+    """Move the live journal aside so it can be folded into a snapshot.
+
+    Must be called with _snapshot_lock held.
+
+    Args:
+        raw: Current snapshot bytes the rotated journal applies on top of
+
+    Returns:
+        bool: True if there was a journal to rotate
+    """
+    global _live_records
+    with _journal_lock:
+        if not os.path.exists(JOURNAL_FILE):
+            return False
+        with open(BASE_FILE, "w") as f:
+            f.write(_fingerprint(raw))
+        os.replace(JOURNAL_FILE, COMPACTING_FILE)
+        _live_records = 0
+    return True
+
+
+def _append_all_or_nothing(path, data):
+    """Append data to path and fsync it, or leave path as it was on failure.
+
+    A failed write (e.g. a full disk) is truncated away, so retrying the same
+    records cannot leave them in the journal twice.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        except BaseException:
+            os.ftruncate(fd, size)
+            raise
+    finally:
+        os.close(fd)
+
+
+def append_record(op, **fields):
+    """Append a single mutation record to the journal.
+
+    Starts a background compaction once the journal grows past
+    JOURNAL_COMPACT_THRESHOLD records.
+
+    Args:
+        op: Operation name (see apply_record for supported operations)
+        **fields: Operation fields, all JSON-serializable
+    """
+    append_records([dict(fields, op=op)])
+
+
+def append_records(records):
+    """Append several mutation records to the journal in one write.
+
+    The records are written all or nothing.
+
+    Args:
+        records: List of record dictionaries, each with an "op" key
+    """
+    global _live_records, _journal_checked
+    if not records:
+        return
+    lines = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+    with _journal_lock:
+        if not _journal_checked:
+            _trim_torn_tail(JOURNAL_FILE)
+            _journal_checked = True
+        _append_all_or_nothing(JOURNAL_FILE, lines)
+        _live_records += len(records)
+        needs_compaction = _live_records >= JOURNAL_COMPACT_THRESHOLD
+    if needs_compaction:
+        start_background_compaction()
+
+
+def compact_journal():
+    """Fold the journal into a new snapshot and remove the folded records."""
+    with _snapshot_lock:
+        _recover_compaction()
+        raw = _read_snapshot_bytes()
+        if not _rotate_journal(raw):
+            return
+        items = _replay(_parse_snapshot(raw), _read_records(COMPACTING_FILE))
+        _write_snapshot(items)
+        _remove(COMPACTING_FILE)
+        _remove(BASE_FILE)
+
+
+def start_background_compaction():
+    """Run compact_journal on a daemon thread unless one is already running."""
+    global _compaction_thread
+    with _journal_lock:
+        if _compaction_thread is not None and _compaction_thread.is_alive():
+            return
+        _compaction_thread = threading.Thread(
+            target=_compact_quietly, name="journal-compaction", daemon=True
+        )
+        _compaction_thread.start()
+
+
+def _compact_quietly():
+    try:
+        compact_journal()
+    except Exception:
+        # Leave the files in place; the next load or compaction recovers them
+        pass
+
+
+def write_full_snapshot(items):
+    """Replace the snapshot with items and discard all journal records.
+
+    Args:
+        items: List of task dictionaries describing the complete state
+    """
+    with _snapshot_lock:
+        _recover_compaction()
+        _rotate_journal(_read_snapshot_bytes())
+        # The rotated journal no longer matches once the snapshot is replaced
+        _write_snapshot(items)
+        _remove(COMPACTING_FILE)
+        _remove(BASE_FILE)
+
+
+def load_items(lazy=False):
+    """Return the current task dictionaries: snapshot plus replayed journal.
+
+    Args:
+        lazy: Return completed tasks as summaries (see _items_from_index)
+            when a valid index is available
+    """
+    global _live_records
+    with _snapshot_lock:
+        _recover_compaction()
+        index = _read_index() if lazy else None
+        if index is not None:
+            _publish_index(*index)
+            try:
+                items = _items_from_index(*index)
+            except (OSError, ValueError, KeyError, TypeError):
+                index = None
+        if index is None:
+            items = _parse_snapshot(_read_snapshot_bytes())
+            if lazy and items:
+                # Snapshot predates the index; rewrite it once so the next
+                # start can load lazily
+                try:
+                    _write_snapshot(items)
+                except OSError:
+                    pass
+        with _journal_lock:
+            records = _read_records(JOURNAL_FILE)
+            _live_records = len(records)
+    return _replay(items, records)
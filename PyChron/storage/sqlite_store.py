@@ -0,0 +1,314 @@
+"""Optional SQLite storage backend with normalized tasks and sessions tables.
+
+Enabled by setting STORAGE_BACKEND = "sqlite" in constants.py. Each change
+recorded by the handlers becomes a targeted INSERT/UPDATE/DELETE, and the
+database runs in WAL mode so writes stay cheap as history grows. On first
+use an existing tasks.json (plus journal) is imported automatically.
+"""
+
+import sqlite3
+import threading
+
+from constants import DATABASE_FILE
+
+from . import journal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'In Progress',
+    note TEXT,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    name TEXT,
+    note TEXT,
+    UNIQUE (task_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_sessions_task ON sessions(task_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_task_start ON sessions(task_id, start_time);
+"""
+
+# Session dictionary keys -> sessions table columns
+SESSION_COLUMNS = {
+    "start": "start_time",
+    "end": "end_time",
+    "name": "name",
+    "note": "note",
+}
+
+# sqlite3 connections cannot be shared across threads
+_local = threading.local()
+
+
+def get_connection(path=DATABASE_FILE):
+    """Return this thread's connection to the database, creating it if needed."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _task_id(conn, name):
+    row = conn.execute("SELECT id FROM tasks WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _insert_task(conn, item):
+    cur = conn.execute(
+        "INSERT INTO tasks (name, status, note, position) "
+        "VALUES (?, ?, ?, (SELECT COALESCE(MAX(position), 0) + 1 FROM tasks))",
+        (item["name"], item.get("status", "In Progress"), item.get("note")),
+    )
+    return cur.lastrowid
+
+
+def _insert_session(conn, task_id, idx, entry):
+    conn.execute(
+        "INSERT INTO sessions (task_id, idx, start_time, end_time, name, note) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            task_id,
+            idx,
+            entry["start"],
+            entry["end"],
+            entry.get("name"),
+            entry.get("note"),
+        ),
+    )
+
+
+def _apply(conn, op, fields):
+    """Translate one change record into row-level SQL statements."""
+    name = fields.get("name")
+    if op == "add_task":
+        # Re-adding a name starts it over, matching the journal semantics
+        conn.execute("DELETE FROM tasks WHERE name = ?", (name,))
+        _insert_task(conn, fields)
+    elif op == "update_task":
+        for key in ("status", "note"):
+            if key in fields:
+                conn.execute(f"UPDATE tasks SET {key} = ? WHERE name = ?", (fields[key], name))
+    elif op == "rename_task":
+        conn.execute("UPDATE tasks SET name = ? WHERE name = ?", (fields["new_name"], name))
+    elif op == "delete_task":
+        conn.execute("DELETE FROM tasks WHERE name = ?", (name,))
+    elif op == "clear":
+        conn.execute("DELETE FROM sessions")
+        conn.execute("DELETE FROM tasks")
+    elif op == "add_session":
+        task_id = _task_id(conn, name)
+        if task_id is not None:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            _insert_session(conn, task_id, count, fields["session"])
+    elif op == "update_session":
+        for key, value in fields.get("fields", {}).items():
+            column = SESSION_COLUMNS.get(key)
+            if column is None:
+                continue
+            conn.execute(
+                f"UPDATE sessions SET {column} = ? "
+                "WHERE task_id = (SELECT id FROM tasks WHERE name = ?) AND idx = ?",
+                (value, name, fields["index"]),
+            )
+
+
+def apply_change(op, **fields):
+    """Apply a single task mutation as targeted row-level statements.
+
+    Args:
+        op: Operation name (same vocabulary as storage.journal.apply_record)
+        **fields: Operation fields
+    """
+    apply_changes([dict(fields, op=op)])
+
+
+def apply_changes(records):
+    """Apply several mutation records in a single transaction.
+
+    Args:
+        records: List of record dictionaries, each with an "op" key
+    """
+    conn = get_connection()
+    with conn:
+        for record in records:
+            _apply(conn, record.get("op"), record)
+
+
+def write_full_snapshot(items):
+    """Replace the database contents with the given task dictionaries."""
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM sessions")
+        conn.execute("DELETE FROM tasks")
+        for item in items:
+            task_id = _insert_task(conn, item)
+            for idx, entry in enumerate(item.get("timings", [])):
+                _insert_session(conn, task_id, idx, entry)
+
+
+def load_sessions(task_id):
+    """Return one task's sessions as timing dictionaries, in order."""
+    return [
+        {"start": start, "end": end, "name": name, "note": note}
+        for start, end, name, note in get_connection().execute(
+            "SELECT start_time, end_time, name, note FROM sessions WHERE task_id = ? ORDER BY idx",
+            (task_id,),
+        )
+    ]
+
+
+def _sessions_loader(task_id):
+    """Return a callable that loads a task's sessions by its stable row id."""
+    return lambda task=None: load_sessions(task_id)
+
+
+def _sessions_range_loader(task_id):
+    """Return a callable that loads a task's sessions starting in a range.
+
+    The callable takes (task, start, end) with ISO-8601 bounds (None for
+    open) and yields (index, timing dictionary) pairs, so the range is
+    filtered in SQL rather than after loading every session.
+    """
+
+    def load_between(task, start, end):
+        for row in query_sessions(start=start, end=end, task_id=task_id):
+            idx, start_time, end_time, name, note = row[3:]
+            yield idx, {"start": start_time, "end": end_time, "name": name, "note": note}
+
+    return load_between
+
+
+def load_items(lazy=False):
+    """Return all tasks as dictionaries in the tasks.json schema.
+
+    Imports the JSON data the first time the database is opened.
+
+    Args:
+        lazy: Return completed tasks as summaries with "total_seconds",
+            "session_count" and a "load_timings" callable instead of
+            "timings"
+    """
+    conn = get_connection()
+    (migrated,) = conn.execute("PRAGMA user_version").fetchone()
+    if not migrated:
+        migrate_json()
+
+    items = {}
+    for task_id, name, status, note in conn.execute(
+        "SELECT id, name, status, note FROM tasks ORDER BY position"
+    ):
+        items[task_id] = {"name": name, "timings": [], "status": status, "note": note}
+
+    sessions_sql = (
+        "SELECT task_id, start_time, end_time, name, note FROM sessions ORDER BY task_id, idx"
+    )
+    if lazy:
+        # Per-session durations truncated to whole seconds, like Task does
+        for task_id, count, total in conn.execute(
+            "SELECT t.id, COUNT(s.id), COALESCE(SUM(CAST(ROUND("
+            "(julianday(s.end_time) - julianday(s.start_time)) * 86400000"
+            ") AS INTEGER) / 1000), 0) "
+            "FROM tasks t LEFT JOIN sessions s ON s.task_id = t.id "
+            "WHERE t.status = 'Completed' GROUP BY t.id"
+        ):
+            item = items[task_id]
+            del item["timings"]
+            item["total_seconds"] = total
+            item["session_count"] = count
+            item["load_timings"] = _sessions_loader(task_id)
+            item["load_timings_between"] = _sessions_range_loader(task_id)
+        sessions_sql = (
+            "SELECT s.task_id, s.start_time, s.end_time, s.name, s.note "
+            "FROM sessions s JOIN tasks t ON t.id = s.task_id "
+            "WHERE t.status != 'Completed' ORDER BY s.task_id, s.idx"
+        )
+
+    for task_id, start, end, name, note in conn.execute(sessions_sql):
+        items[task_id]["timings"].append({"start": start, "end": end, "name": name, "note": note})
+    return list(items.values())
+
+
+def migrate_json(replace=False):
+    """Import the current tasks.json snapshot and journal into the database.
+
+    Args:
+        replace: Overwrite existing database rows instead of skipping the
+            import when the database already holds tasks
+
+    Returns:
+        int: Number of tasks imported
+    """
+    conn = get_connection()
+    (task_count,) = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+    if task_count and not replace:
+        return 0
+    items = journal.load_items()
+    if items:
+        write_full_snapshot(items)
+    # Mark the database as initialized so an emptied database is not re-imported
+    conn.execute("PRAGMA user_version = 1")
+    return len(items)
+
+
+def query_sessions(statuses=None, start=None, end=None, task_id=None):
+    """Yield session rows filtered in SQL by task status and start time.
+
+    Lets exports and reports read a slice of history without loading every
+    session; lazily loaded tasks use it for Task.iter_sessions_between.
+
+    Args:
+        statuses: Iterable of task statuses to include (None for all)
+        start: Inclusive ISO-8601 lower bound on session start (optional)
+        end: Exclusive ISO-8601 upper bound on session start (optional)
+        task_id: Only return sessions of the task with this row id (optional)
+
+    Yields:
+        tuple: (task_name, task_status, task_note, session_index,
+        session_start, session_end, session_name, session_note)
+    """
+    sql = (
+        "SELECT t.name, t.status, t.note, s.idx, s.start_time, s.end_time, "
+        "s.name, s.note FROM sessions s JOIN tasks t ON t.id = s.task_id"
+    )
+    clauses = []
+    params = []
+    if statuses is not None:
+        statuses = list(statuses)
+        clauses.append(f"t.status IN ({', '.join('?' for _ in statuses)})")
+        params.extend(statuses)
+    if start is not None:
+        clauses.append("s.start_time >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("s.start_time < ?")
+        params.append(end)
+    if task_id is not None:
+        clauses.append("s.task_id = ?")
+        params.append(task_id)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY t.position, s.idx"
+    yield from get_connection().execute(sql, params)
+
+
+def compact():
+    """Checkpoint the WAL into the main database file."""
+    conn = get_connection()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("PRAGMA optimize")
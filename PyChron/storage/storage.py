@@ -1,25 +1,113 @@
 """Storage functions for persisting tasks to disk."""
 
-import json
-import os
+import threading
 
-from constants import DATA_FILE
+from constants import LAZY_LOAD_COMPLETED, STORAGE_BACKEND
 from models import Task
 
+from . import journal, sqlite_store
+
+
+def _use_sqlite():
+    return STORAGE_BACKEND == "sqlite"
+
 
 def save_tasks(tasks):
-    """Save tasks dictionary to JSON file."""
-    with open(DATA_FILE, "w") as f:
-        json.dump([task.to_dict() for task in tasks.values()], f, indent=4)
+    """Write a full snapshot of the tasks dictionary to the active backend."""
+    items = [task.to_dict() for task in tasks.values()]
+    if _use_sqlite():
+        sqlite_store.write_full_snapshot(items)
+    else:
+        journal.write_full_snapshot(items)
+
+
+def load_tasks(lazy=None):
+    """Load tasks from the active backend and return as dictionary.
+
+    Args:
+        lazy: Load completed tasks as stubs whose timings are read from disk
+            on first access (defaults to LAZY_LOAD_COMPLETED)
+    """
+    if lazy is None:
+        lazy = LAZY_LOAD_COMPLETED
+    if _use_sqlite():
+        items = sqlite_store.load_items(lazy)
+    else:
+        items = journal.load_items(lazy)
+    tasks = {}
+    for item in items:
+        try:
+            if "load_timings" in item:
+                task = Task.from_summary(
+                    item["name"],
+                    item["status"],
+                    item.get("note"),
+                    item["total_seconds"],
+                    item["session_count"],
+                    item["load_timings"],
+                    range_loader=item.get("load_timings_between"),
+                )
+            else:
+                task = Task.from_dict(item)
+            tasks[item["name"]] = task
+        except (KeyError, TypeError, AttributeError):
+            continue
+    return tasks
+
+
+def load_tasks_async(results, lazy=None):
+    """Load tasks on a worker thread and hand the outcome over on a queue.
+
+    Puts ("loaded", tasks) or ("error", exception) on results once loading
+    finishes, so the Tk thread can poll for it without blocking.
 
+    Args:
+        results: Thread-safe queue (e.g. queue.Queue) to put the outcome on
+        lazy: See load_tasks
 
-def load_tasks():
-    """Load tasks from JSON file and return as dictionary."""
-    if os.path.exists(DATA_FILE):
+    Returns:
+        The started worker thread
+    """
+
+    def worker():
         try:
-            with open(DATA_FILE, "r") as f:
-                data = json.load(f)
-                return {item["name"]: Task.from_dict(item) for item in data}
-        except (json.JSONDecodeError, KeyError):
-            return {}
-    return {}
+            results.put(("loaded", load_tasks(lazy)))
+        except Exception as exc:
+            results.put(("error", exc))
+
+    thread = threading.Thread(target=worker, name="pychron-load", daemon=True)
+    thread.start()
+    return thread
+
+
+def record_change(op, **fields):
+    """Persist a single task mutation without rewriting the whole file.
+
+    Args:
+        op: Operation name, e.g. "add_task", "add_session", "update_session"
+        **fields: Operation fields (see storage.journal.apply_record)
+    """
+    if _use_sqlite():
+        sqlite_store.apply_change(op, **fields)
+    else:
+        journal.append_record(op, **fields)
+
+
+def record_changes(records):
+    """Persist a batch of task mutations in a single write.
+
+    Args:
+        records: List of change dictionaries, each with an "op" key
+    """
+    if _use_sqlite():
+        sqlite_store.apply_changes(records)
+    else:
+        journal.append_records(records)
+
+
+def compact_storage():
+    """Fold pending changes into the backend's main file (e.g. on exit)."""
+    if _use_sqlite():
+        sqlite_store.compact()
+    else:
+        journal.compact_journal()
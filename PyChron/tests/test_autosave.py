@@ -0,0 +1,42 @@
+"""Tests for the background autosave writer."""
+
+from storage.autosave import AutosaveWriter
+
+
+def test_failing_record_is_skipped_and_later_records_are_written():
+    written = []
+
+    def write_batch(batch):
+        if any(record["op"] == "bad" for record in batch):
+            raise ValueError("cannot save")
+        written.extend(record["op"] for record in batch)
+
+    writer = AutosaveWriter(write_batch, debounce_ms=1, max_delay_ms=10, max_retries=2)
+    writer.submit("first")
+    writer.submit("bad")
+    writer.submit("last")
+    assert writer.close(timeout=5)
+
+    assert written == ["first", "last"]
+    skipped = writer.take_skipped()
+    assert [record["op"] for record, _ in skipped] == ["bad"]
+    assert skipped[0][1] == "cannot save"
+    assert writer.stats()["skipped"] == 1
+    assert writer.take_skipped() == []
+
+
+def test_transient_failure_is_retried_without_skipping():
+    attempts = []
+
+    def write_batch(batch):
+        attempts.append(len(batch))
+        if len(attempts) == 1:
+            raise OSError("busy")
+
+    writer = AutosaveWriter(write_batch, debounce_ms=1, max_delay_ms=10, max_retries=3)
+    writer.submit("a")
+    writer.submit("b")
+    assert writer.close(timeout=5)
+
+    assert attempts == [2, 2]
+    assert writer.take_skipped() == []
@@ -0,0 +1,66 @@
+"""Tests for the append-only change journal."""
+
+import pytest
+
+from storage import journal
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run against empty data files in a temporary directory."""
+    # DATA_FILE and JOURNAL_FILE are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(journal, "_journal_checked", False)
+    monkeypatch.setattr(journal, "_live_records", 0)
+    return tmp_path
+
+
+def _names(items):
+    return [item["name"] for item in items]
+
+
+def test_append_after_torn_line_keeps_later_records(workdir):
+    journal.append_record("add_task", name="a")
+    # An interrupted append leaves a partial line without a newline
+    with open(journal.JOURNAL_FILE, "ab") as f:
+        f.write(b'{"op": "add_task", "na')
+
+    # A new run appends after it
+    journal._journal_checked = False
+    journal.append_record("add_task", name="b")
+    journal.append_record("add_task", name="c")
+
+    assert _names(journal.load_items()) == ["a", "b", "c"]
+    with open(journal.JOURNAL_FILE, "rb") as f:
+        assert f.read().count(b"\n") == 3
+
+
+def test_bad_line_in_the_middle_is_skipped(workdir):
+    with open(journal.JOURNAL_FILE, "w", encoding="utf-8") as f:
+        f.write('{"op": "add_task", "name": "a"}\n')
+        f.write('{"op": "add_task", "na{"op": "add_task", "name": "x"}\n')
+        f.write('{"op": "add_task", "name": "b"}\n')
+
+    assert _names(journal.load_items()) == ["a", "b"]
+
+
+def test_failed_append_leaves_no_partial_records(workdir, monkeypatch):
+    journal.append_record("add_task", name="a")
+
+    real_write = journal.os.write
+
+    def short_write(fd, data):
+        # Write part of the batch, then fail like a full disk
+        real_write(fd, bytes(data[:10]))
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(journal.os, "write", short_write)
+    with pytest.raises(OSError):
+        journal.append_records([{"op": "add_task", "name": "b"}])
+    monkeypatch.setattr(journal.os, "write", real_write)
+
+    # Retrying the batch writes it exactly once
+    journal.append_records([{"op": "add_task", "name": "b"}])
+    assert _names(journal.load_items()) == ["a", "b"]
+    with open(journal.JOURNAL_FILE, "rb") as f:
+        assert f.read().count(b"\n") == 2
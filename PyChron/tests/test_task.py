@@ -0,0 +1,63 @@
+"""Tests for the cached session total kept by Task."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Task
+from models.session import Session
+
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def check_invariants(monkeypatch):
+    """Verify the cached total on every get_total_duration call."""
+    monkeypatch.setattr(Task, "CHECK_INVARIANTS", True)
+
+
+def _session(offset_minutes, seconds):
+    start = START + timedelta(minutes=offset_minutes)
+    return Session.from_datetimes(start, start + timedelta(seconds=seconds))
+
+
+def _recomputed(task):
+    return timedelta(seconds=sum(session.seconds for session in task.timings))
+
+
+def test_add_update_remove_keep_total_in_sync():
+    task = Task("task")
+    task.add_session(_session(0, 90.7))
+    task.add_session(_session(10, 30))
+    assert task.get_total_duration() == _recomputed(task) == timedelta(seconds=120)
+
+    end = task.timings[0].start + timedelta(seconds=45)
+    task.update_session(0, end_us=Session.from_datetimes(end, end).end_us)
+    assert task.get_total_duration() == _recomputed(task) == timedelta(seconds=75)
+
+    task.update_session(1, name="renamed", note="note")
+    assert task.get_total_duration() == _recomputed(task)
+
+    task.remove_session(0)
+    assert task.get_total_duration() == _recomputed(task) == timedelta(seconds=30)
+
+
+def test_stub_total_matches_loaded_sessions():
+    sessions = [_session(0, 60), _session(5, 120.9)]
+    timings = [session.to_dict() for session in sessions]
+    task = Task.from_summary("stub", "Completed", None, 180, 2, lambda task: timings)
+
+    # The summary total is used without loading the sessions
+    assert task.get_total_duration() == timedelta(seconds=180)
+    assert not task.is_loaded
+
+    task.add_session(_session(10, 15))
+    assert task.is_loaded
+    assert task.get_total_duration() == _recomputed(task) == timedelta(seconds=195)
+
+
+def test_drifted_total_is_reported():
+    task = Task("task", [_session(0, 60)])
+    task._closed_seconds += 1
+    with pytest.raises(AssertionError, match="cached total 61s"):
+        task.get_total_duration()
@@ -1,8 +1,10 @@
 """Dialog functions for user interactions."""
 
+from datetime import date, timedelta
 from tkinter import filedialog, messagebox
 
 import customtkinter as ctk
+
 from constants import DESKTOP_PATH
 
 
@@ -367,7 +369,14 @@ def export_dialog(parent, perform_export_callback):
     Args:
         parent: Parent window
         perform_export_callback: Function to call with (out_dir, name, formats)
+            and the incremental, layout, compression, start, end, statuses
+            and match keyword arguments
     """
+    # Columnar formats are only offered when pyarrow is installed
+    from export import pyarrow_available, zstd_available
+
+    show_arrow = pyarrow_available()
+
     dlg = ctk.CTkToplevel(parent)
     dlg.title("Export Tasks")
     dlg.transient(parent)
@@ -376,8 +385,8 @@ def export_dialog(parent, perform_export_callback):
     # Center dialog roughly
     try:
         parent.update_idletasks()
-        w = 480
-        h = 240
+        w = 560
+        h = 500 if show_arrow else 470
         x = parent.winfo_x() + (parent.winfo_width() - w) // 2
         y = parent.winfo_y() + (parent.winfo_height() - h) // 2
         dlg.geometry(f"{w}x{h}+{x}+{y}")
@@ -393,18 +402,79 @@ def export_dialog(parent, perform_export_callback):
     name_entry.grid(row=0, column=1, sticky="ew", padx=(8, 0))
     frm.grid_columnconfigure(1, weight=1)
 
-    ctk.CTkLabel(frm, text="Export Formats:").grid(
-        row=1, column=0, sticky="w", pady=(8, 0)
-    )
+    ctk.CTkLabel(frm, text="Export Formats:").grid(row=1, column=0, sticky="w", pady=(8, 0))
     csv_var = ctk.BooleanVar(value=True)
     json_var = ctk.BooleanVar(value=False)
     xlsx_var = ctk.BooleanVar(value=False)
+    ndjson_var = ctk.BooleanVar(value=False)
     cb_csv = ctk.CTkCheckBox(frm, text="CSV", variable=csv_var)
     cb_json = ctk.CTkCheckBox(frm, text="JSON", variable=json_var)
     cb_xlsx = ctk.CTkCheckBox(frm, text="XLSX", variable=xlsx_var)
+    cb_ndjson = ctk.CTkCheckBox(frm, text="NDJSON", variable=ndjson_var)
     cb_csv.grid(row=1, column=1, sticky="w")
     cb_json.grid(row=1, column=1, sticky="w", padx=(70, 0))
     cb_xlsx.grid(row=1, column=1, sticky="w", padx=(150, 0))
+    cb_ndjson.grid(row=1, column=1, sticky="w", padx=(230, 0))
+
+    parquet_var = ctk.BooleanVar(value=False)
+    arrow_var = ctk.BooleanVar(value=False)
+    if show_arrow:
+        cb_parquet = ctk.CTkCheckBox(frm, text="Parquet", variable=parquet_var)
+        cb_arrow = ctk.CTkCheckBox(frm, text="Arrow", variable=arrow_var)
+        cb_parquet.grid(row=2, column=1, sticky="w", pady=(8, 0))
+        cb_arrow.grid(row=2, column=1, sticky="w", padx=(100, 0), pady=(8, 0))
+
+    # Full export, or only sessions new or changed since the last incremental one
+    modes = {
+        "Full": None,
+        "New/changed only (new files)": "delta",
+        "New/changed only (append)": "append",
+    }
+    ctk.CTkLabel(frm, text="Export Mode:").grid(row=3, column=0, sticky="w", pady=(8, 0))
+    mode_var = ctk.StringVar(value="Full")
+    mode_menu = ctk.CTkOptionMenu(frm, variable=mode_var, values=list(modes))
+    mode_menu.grid(row=3, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+
+    # Text formats can be compressed as they are written
+    compressions = {"None": None, "gzip": "gzip"}
+    if zstd_available():
+        compressions["zstd"] = "zstd"
+    ctk.CTkLabel(frm, text="Compression:").grid(row=4, column=0, sticky="w", pady=(8, 0))
+    compression_var = ctk.StringVar(value="None")
+    compression_menu = ctk.CTkOptionMenu(frm, variable=compression_var, values=list(compressions))
+    compression_menu.grid(row=4, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+
+    # Normalized layout: separate tasks and sessions tables instead of
+    # repeating each task's name and note on every session row
+    normalized_var = ctk.BooleanVar(value=False)
+    cb_normalized = ctk.CTkCheckBox(
+        frm, text="Separate tasks and sessions tables", variable=normalized_var
+    )
+    cb_normalized.grid(row=5, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+
+    # Filters: sessions starting in a date range, task statuses and a
+    # name/note match; empty dates leave the range open on that side
+    ctk.CTkLabel(frm, text="Date Range:").grid(row=6, column=0, sticky="w", pady=(8, 0))
+    range_frame = ctk.CTkFrame(frm, fg_color="transparent")
+    range_frame.grid(row=6, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+    # No textvariables: CTkEntry only shows placeholder text without one
+    start_entry = ctk.CTkEntry(range_frame, width=110, placeholder_text="YYYY-MM-DD")
+    start_entry.pack(side="left")
+    ctk.CTkLabel(range_frame, text="to").pack(side="left", padx=6)
+    end_entry = ctk.CTkEntry(range_frame, width=110, placeholder_text="YYYY-MM-DD")
+    end_entry.pack(side="left")
+
+    ctk.CTkLabel(frm, text="Task Status:").grid(row=7, column=0, sticky="w", pady=(8, 0))
+    completed_var = ctk.BooleanVar(value=True)
+    in_progress_var = ctk.BooleanVar(value=False)
+    cb_completed = ctk.CTkCheckBox(frm, text="Completed", variable=completed_var)
+    cb_in_progress = ctk.CTkCheckBox(frm, text="In Progress", variable=in_progress_var)
+    cb_completed.grid(row=7, column=1, sticky="w", padx=(8, 0), pady=(8, 0))
+    cb_in_progress.grid(row=7, column=1, sticky="w", padx=(130, 0), pady=(8, 0))
+
+    ctk.CTkLabel(frm, text="Task Filter:").grid(row=8, column=0, sticky="w", pady=(8, 0))
+    match_entry = ctk.CTkEntry(frm, placeholder_text="Name or note contains (* wildcards)")
+    match_entry.grid(row=8, column=1, sticky="ew", padx=(8, 0), pady=(8, 0))
 
     # directory selector
     dir_var = ctk.StringVar(value=DESKTOP_PATH)
@@ -414,16 +484,16 @@ def export_dialog(parent, perform_export_callback):
         if p:
             dir_var.set(p)
 
-    ctk.CTkLabel(frm, text="Directory:").grid(row=2, column=0, sticky="w", pady=(8, 0))
+    ctk.CTkLabel(frm, text="Directory:").grid(row=9, column=0, sticky="w", pady=(8, 0))
     dir_lbl = ctk.CTkLabel(frm, textvariable=dir_var, anchor="w", justify="left")
-    dir_lbl.grid(row=2, column=1, sticky="nw", padx=(4, 0), pady=(20, 0))
+    dir_lbl.grid(row=9, column=1, sticky="nw", padx=(4, 0), pady=(20, 0))
     frm.grid_columnconfigure(1, weight=1)
 
     dir_btn = ctk.CTkButton(frm, text="Browse...", command=_choose_dir, width=96)
-    dir_btn.grid(row=3, column=0, columnspan=2, pady=(20, 0))
+    dir_btn.grid(row=10, column=0, columnspan=2, pady=(20, 0))
 
     btn_frame = ctk.CTkFrame(frm, fg_color="transparent")
-    btn_frame.grid(row=4, column=0, columnspan=2, pady=(20, 0))
+    btn_frame.grid(row=11, column=0, columnspan=2, pady=(20, 0))
 
     def _on_export():
         name = name_var.get().strip()
@@ -434,16 +504,54 @@ def export_dialog(parent, perform_export_callback):
             formats.append("json")
         if xlsx_var.get():
             formats.append("xlsx")
+        if ndjson_var.get():
+            formats.append("ndjson")
+        if parquet_var.get():
+            formats.append("parquet")
+        if arrow_var.get():
+            formats.append("arrow")
         if not name:
             messagebox.showerror("Export", "Please provide a filename.")
             return
         if not formats:
             messagebox.showerror("Export", "Please select at least one format.")
             return
+        statuses = []
+        if completed_var.get():
+            statuses.append("Completed")
+        if in_progress_var.get():
+            statuses.append("In Progress")
+        if not statuses:
+            messagebox.showerror("Export", "Please select at least one task status.")
+            return
+        start_text = start_entry.get().strip()
+        end_text = end_entry.get().strip()
+        try:
+            start = date.fromisoformat(start_text) if start_text else None
+            end = date.fromisoformat(end_text) if end_text else None
+        except ValueError:
+            messagebox.showerror("Export", "Please enter dates as YYYY-MM-DD.")
+            return
+        if end is not None:
+            end += timedelta(days=1)  # The end date is included
+        if start is not None and end is not None and start >= end:
+            messagebox.showerror("Export", "The start date is after the end date.")
+            return
         out_dir = dir_var.get()
         dlg.grab_release()
         dlg.destroy()
-        perform_export_callback(out_dir, name, formats)
+        perform_export_callback(
+            out_dir,
+            name,
+            formats,
+            incremental=modes[mode_var.get()],
+            layout="normalized" if normalized_var.get() else "denormalized",
+            compression=compressions[compression_var.get()],
+            start=start,
+            end=end,
+            statuses=tuple(statuses),
+            match=match_entry.get().strip() or None,
+        )
 
     def _on_cancel():
         dlg.grab_release()
@@ -485,10 +593,7 @@ def prompt_session_name(parent, current_name=None):
 
     lbl = ctk.CTkLabel(
         dlg,
-        text=(
-            "Enter session name "
-            "(leave empty for default 'Session N'):"
-        ),
+        text=("Enter session name (leave empty for default 'Session N'):"),
     )
     lbl.pack(padx=20, pady=(18, 8))
 
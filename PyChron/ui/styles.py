@@ -0,0 +1,119 @@
+"""Style registry mapping named color roles to the active theme."""
+
+import weakref
+
+# Colors for each named role, per theme
+THEMES = {
+    "Light": {
+        "main_bg": "#F5F5F5",
+        "container_bg": "#FFFFFF",
+        "header_bg": "#E0E0E0",
+        "header_text": "#000000",
+        "text": "#000000",
+        "pencil_bg": "#E0E0E0",
+        "pencil_hover": "#BDBDBD",
+        "pencil_text": "#000000",
+        "note_set_bg": "#F9A825",
+        "note_set_hover": "#F57F17",
+        "note_empty_bg": "#F5F5DC",
+        "note_empty_hover": "#E8E8D3",
+        "note_text": "#000000",
+    },
+    "Dark": {
+        "main_bg": "#1f1f1f",
+        "container_bg": "#2b2b2b",
+        "header_bg": "#3a3a3a",
+        "header_text": "#FFFFFF",
+        "text": "#FFFFFF",
+        "pencil_bg": "#555555",
+        "pencil_hover": "#777777",
+        "pencil_text": "#FFFFFF",
+        "note_set_bg": "#F9A825",
+        "note_set_hover": "#F57F17",
+        "note_empty_bg": "#F5F5DC",
+        "note_empty_hover": "#E8E8D3",
+        "note_text": "#000000",
+    },
+}
+
+
+class StyleRegistry:
+    """Keeps widgets subscribed to named color roles of the active theme.
+
+    Widgets subscribe in groups (for example one group per task row). A
+    theme change restyles only the groups passed to set_theme; every other
+    group is marked stale and restyled by ensure_current when it is shown
+    again, so switching themes costs the same no matter how many tasks
+    exist.
+    """
+
+    GLOBAL = "global"  # Group for window-level widgets, always restyled
+
+    def __init__(self, theme="Dark"):
+        self.theme = theme
+        self.version = 0
+        # Group -> {widget: {option: role}}; destroyed widgets drop out once
+        # nothing else references them
+        self._groups = {}
+        self._group_versions = {}
+
+    def color(self, role):
+        """Return the active theme's color for a role."""
+        return THEMES[self.theme][role]
+
+    def options(self, **option_roles):
+        """Resolve {option: role} keyword arguments to {option: color}."""
+        return {option: self.color(role) for option, role in option_roles.items()}
+
+    def note_button_options(self, has_note):
+        """Return the colors for a note button with or without a note."""
+        state = "set" if has_note else "empty"
+        return self.options(
+            fg_color=f"note_{state}_bg",
+            hover_color=f"note_{state}_hover",
+            text_color="note_text",
+        )
+
+    def subscribe(self, widget, group=GLOBAL, **option_roles):
+        """Apply the roles to a widget now and on later theme changes.
+
+        Args:
+            widget: Widget to style
+            group: Key of the group the widget belongs to
+            **option_roles: Widget option name to role name, e.g.
+                fg_color="container_bg"
+        """
+        widgets = self._groups.get(group)
+        if widgets is None:
+            widgets = self._groups[group] = weakref.WeakKeyDictionary()
+        widgets[widget] = option_roles
+        self._group_versions.setdefault(group, self.version)
+        try:
+            widget.configure(**self.options(**option_roles))
+        except Exception:
+            pass
+
+    def set_theme(self, theme, groups=()):
+        """Switch themes and restyle the global group and the given groups."""
+        if theme == self.theme:
+            return
+        self.theme = theme
+        self.version += 1
+        self.ensure_current(self.GLOBAL)
+        for group in groups:
+            self.ensure_current(group)
+
+    def ensure_current(self, group):
+        """Restyle a group's widgets if they predate the last theme change."""
+        if self._group_versions.get(group, self.version) == self.version:
+            return
+        self._group_versions[group] = self.version
+        widgets = self._groups.get(group, {})
+        for widget, option_roles in list(widgets.items()):
+            try:
+                if not widget.winfo_exists():
+                    del widgets[widget]  # Destroyed since it subscribed
+                    continue
+                widget.configure(**self.options(**option_roles))
+            except Exception:
+                pass
@@ -1,5 +1,6 @@
 """Task widget UI components."""
 
-from .task_widget import add_task_to_ui, update_task_ui
+from .session_canvas import SessionTableCanvas
+from .task_list import VirtualTaskList
 
-__all__ = ["add_task_to_ui", "update_task_ui"]
+__all__ = ["SessionTableCanvas", "VirtualTaskList"]
@@ -0,0 +1,265 @@
+"""Session table drawn on a single canvas instead of per-cell widgets."""
+
+import tkinter as tk
+from tkinter import font as tkfont
+
+# Column index of the session name and note cells
+NAME_COLUMN = 0
+NOTE_COLUMN = 4
+ACTIONS_COLUMN_WIDTH = 80
+CELL_PADX = 6
+CELL_PADY = 4
+HEADERS = ("Session", "Start", "End", "Duration", "Actions")
+
+
+class SessionTableCanvas(tk.Canvas):
+    """Draws a task's session table as canvas items.
+
+    Each session is a handful of text and rectangle items rather than about
+    six Tk widgets, so tasks with thousands of sessions stay responsive.
+    Clicks on the session name and note columns are hit-tested and passed
+    to the callbacks with the session index.
+
+    Colors are set through configure like any other option (text_color,
+    header_bg, header_text, note_set_bg, note_empty_bg, note_text), so the
+    table can subscribe to the style registry.
+    """
+
+    _COLOR_OPTIONS = (
+        "text_color",
+        "header_bg",
+        "header_text",
+        "note_set_bg",
+        "note_empty_bg",
+        "note_text",
+    )
+
+    def __init__(self, parent, on_edit_name, on_edit_note, **kwargs):
+        """Create an empty table.
+
+        Args:
+            parent: Parent widget
+            on_edit_name: Function called with the index of a clicked name
+            on_edit_note: Function called with the index of a clicked note
+            **kwargs: Canvas and color options
+        """
+        colors = {key: kwargs.pop(key, "#000000") for key in self._COLOR_OPTIONS}
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("bd", 0)
+        super().__init__(parent, height=1, **kwargs)
+        self._colors = colors
+        self._on_edit_name = on_edit_name
+        self._on_edit_note = on_edit_note
+
+        self._font = tkfont.nametofont("TkDefaultFont")
+        self._header_font = self._font.copy()
+        self._header_font.configure(weight="bold")
+        self._row_height = self._font.metrics("linespace") + 2 * CELL_PADY
+        self._header_height = self._header_font.metrics("linespace") + 2 * CELL_PADY + CELL_PADY
+
+        self._rows = []  # Per session: [name, start, end, duration, note, note_bg]
+        self._running = None  # Item ids of the running row, if any
+        self._centers = [0] * len(HEADERS)
+        self._header_rects = []
+
+        for col, text in enumerate(HEADERS):
+            rect = self.create_rectangle(0, 0, 0, 0, width=0, tags=("hdr_bg", f"c{col}"))
+            self._header_rects.append(rect)
+            self.create_text(
+                0,
+                self._header_height / 2,
+                text=text,
+                font=self._header_font,
+                tags=("hdr_text", f"c{col}"),
+            )
+
+        self.bind("<Configure>", self._on_resize)
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Motion>", self._on_motion)
+        self._apply_colors()
+
+    @property
+    def row_count(self):
+        return len(self._rows)
+
+    def configure(self, cnf=None, **kwargs):
+        """Configure canvas options and the table's color options."""
+        changed = False
+        for key in self._COLOR_OPTIONS:
+            if key in kwargs:
+                self._colors[key] = kwargs.pop(key)
+                changed = True
+        if changed:
+            self._apply_colors()
+        if cnf or kwargs:
+            return super().configure(cnf, **kwargs)
+        return None
+
+    config = configure
+
+    def _apply_colors(self):
+        colors = self._colors
+        self.itemconfigure("hdr_bg", fill=colors["header_bg"])
+        self.itemconfigure("hdr_text", fill=colors["header_text"])
+        self.itemconfigure("text", fill=colors["text_color"])
+        self.itemconfigure("note_set", fill=colors["note_set_bg"])
+        self.itemconfigure("note_empty", fill=colors["note_empty_bg"])
+        self.itemconfigure("note_text", fill=colors["note_text"])
+
+    def _row_y(self, index):
+        """Vertical center of the row at index."""
+        return self._header_height + index * self._row_height + self._row_height / 2
+
+    def _column_bounds(self, width):
+        """Return (left, right) pixel bounds of each column."""
+        actions = ACTIONS_COLUMN_WIDTH
+        data_width = max(width - actions, 0) / (len(HEADERS) - 1)
+        bounds = []
+        left = 0
+        for _ in range(len(HEADERS) - 1):
+            bounds.append((left, left + data_width))
+            left += data_width
+        bounds.append((left, left + actions))
+        return bounds
+
+    def _on_resize(self, event):
+        bounds = self._column_bounds(event.width)
+        for col, (left, right) in enumerate(bounds):
+            center = (left + right) / 2
+            # Shift every item in the column at once
+            self.move(f"c{col}", center - self._centers[col], 0)
+            self._centers[col] = center
+            self.coords(
+                self._header_rects[col],
+                left + CELL_PADX,
+                CELL_PADY,
+                right - CELL_PADX,
+                self._header_height - CELL_PADY,
+            )
+
+    def _create_cells(self, index, texts, has_note):
+        """Create the items for one row and return their ids."""
+        y = self._row_y(index)
+        items = []
+        for col, text in enumerate(texts):
+            items.append(
+                self.create_text(
+                    self._centers[col],
+                    y,
+                    text=text,
+                    font=self._font,
+                    fill=self._colors["text_color"],
+                    tags=("text", f"c{col}"),
+                )
+            )
+        if has_note is None:
+            return items  # The running row has no note cell
+        note_half = (ACTIONS_COLUMN_WIDTH - 2 * CELL_PADX) / 2
+        center = self._centers[NOTE_COLUMN]
+        half_height = self._row_height / 2 - 2
+        state = "note_set" if has_note else "note_empty"
+        # The background is created first so it is drawn below the text
+        note_bg = self.create_rectangle(
+            center - note_half,
+            y - half_height,
+            center + note_half,
+            y + half_height,
+            width=0,
+            fill=self._colors[f"{state}_bg"],
+            tags=(state, f"c{NOTE_COLUMN}"),
+        )
+        note = self.create_text(
+            center,
+            y,
+            text="Note" if has_note else "Add Note",
+            font=self._font,
+            fill=self._colors["note_text"],
+            tags=("note_text", f"c{NOTE_COLUMN}"),
+        )
+        items.extend([note, note_bg])
+        return items
+
+    def append_row(self, name, start, end, duration, has_note):
+        """Add a row for the next session."""
+        index = len(self._rows)
+        self._rows.append(self._create_cells(index, (f"✏ {name}", start, end, duration), has_note))
+        if self._running is not None:
+            # Keep the running row below the last session
+            for item in self._running:
+                self.move(item, 0, self._row_height)
+        self._update_height()
+
+    def update_row(self, index, name, start, end, duration, has_note):
+        """Refresh the texts of the row at index."""
+        items = self._rows[index]
+        for item, text in zip(items, (f"✏ {name}", start, end, duration)):
+            self.itemconfigure(item, text=text)
+        self.itemconfigure(items[4], text="Note" if has_note else "Add Note")
+        self.dtag(items[5], "note_set")
+        self.dtag(items[5], "note_empty")
+        state = "note_set" if has_note else "note_empty"
+        self.addtag_withtag(state, items[5])
+        self.itemconfigure(items[5], fill=self._colors[f"{state}_bg"])
+
+    def truncate(self, count):
+        """Remove rows past the first count sessions."""
+        while len(self._rows) > count:
+            for item in self._rows.pop():
+                self.delete(item)
+            if self._running is not None:
+                for item in self._running:
+                    self.move(item, 0, -self._row_height)
+        self._update_height()
+
+    def set_running(self, texts):
+        """Show (session, start, end, duration) texts as the running row, or hide it."""
+        if texts is None:
+            if self._running is not None:
+                for item in self._running:
+                    self.delete(item)
+                self._running = None
+                self._update_height()
+            return
+        if self._running is None:
+            self._running = self._create_cells(len(self._rows), texts, None)
+            self._update_height()
+        else:
+            for item, text in zip(self._running, texts):
+                self.itemconfigure(item, text=text)
+
+    def set_running_duration(self, text):
+        """Update only the duration cell of the running row."""
+        if self._running is not None:
+            self.itemconfigure(self._running[3], text=text)
+
+    def _update_height(self):
+        rows = len(self._rows) + (1 if self._running is not None else 0)
+        height = self._header_height + rows * self._row_height + CELL_PADY
+        super().configure(height=height)
+
+    def _hit(self, event):
+        """Return (session index, column) under the pointer, or None."""
+        index = int((event.y - self._header_height) // self._row_height)
+        if event.y < self._header_height or index >= len(self._rows):
+            return None
+        for col, (left, right) in enumerate(self._column_bounds(self.winfo_width())):
+            if left <= event.x < right:
+                return index, col
+        return None
+
+    def _on_click(self, event):
+        hit = self._hit(event)
+        if hit is None:
+            return
+        index, col = hit
+        if col == NAME_COLUMN:
+            self._on_edit_name(index)
+        elif col == NOTE_COLUMN:
+            self._on_edit_note(index)
+
+    def _on_motion(self, event):
+        hit = self._hit(event)
+        clickable = hit is not None and hit[1] in (NAME_COLUMN, NOTE_COLUMN)
+        cursor = "hand2" if clickable else ""
+        if self.cget("cursor") != cursor:
+            super().configure(cursor=cursor)
@@ -0,0 +1,285 @@
+"""Virtualized task list that only builds rows near the viewport."""
+
+import tkinter as tk
+from bisect import bisect_left
+
+from constants import VIRTUAL_LIST_OVERSCAN_PX
+
+
+def diff_order(old, new):
+    """Compute the changes that turn the key sequence old into new.
+
+    Keys only in new are inserts and keys only in old are removes. Of the
+    keys in both, the longest run that is already in the right relative
+    order stays put and every other key is a move, so the number of moves
+    is minimal.
+
+    Args:
+        old: Sequence of unique keys currently displayed
+        new: Sequence of unique keys in the desired order
+
+    Returns:
+        Tuple (inserts, removes, moves) of key lists
+    """
+    old_pos = {key: i for i, key in enumerate(old)}
+    new_set = set(new)
+    inserts = [key for key in new if key not in old_pos]
+    removes = [key for key in old if key not in new_set]
+
+    # Longest increasing subsequence of old positions, in new order
+    common = [key for key in new if key in old_pos]
+    tails = []  # Smallest old position ending a run of each length
+    tail_index = []  # Index into common for each entry of tails
+    parent = [-1] * len(common)
+    for i, key in enumerate(common):
+        pos = old_pos[key]
+        j = bisect_left(tails, pos)
+        if j == len(tails):
+            tails.append(pos)
+            tail_index.append(i)
+        else:
+            tails[j] = pos
+            tail_index[j] = i
+        parent[i] = tail_index[j - 1] if j else -1
+    stable = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        stable.add(common[i])
+        i = parent[i]
+    moves = [key for key in common if key not in stable]
+    return inserts, removes, moves
+
+
+class VirtualTaskList:
+    """Realizes task rows only for the visible part of a CTkScrollableFrame.
+
+    Rows above and below the viewport are stood in for by two spacer frames
+    whose heights are the summed (measured or estimated) heights of the rows
+    they replace. Rows that scroll out of view are returned to a pool and
+    rebound to other tasks instead of being destroyed, so the number of
+    widgets is bounded by the window height rather than the task count.
+
+    Rows are dictionaries holding at least a "frame" widget; the list
+    stores the key a row is bound to under "key".
+    """
+
+    def __init__(
+        self,
+        scrollable_frame,
+        create_row,
+        bind_row,
+        release_row,
+        estimate_height,
+        pack_options=None,
+        overscan=VIRTUAL_LIST_OVERSCAN_PX,
+    ):
+        """Attach the list to a scrollable frame.
+
+        Args:
+            scrollable_frame: CTkScrollableFrame to place rows in
+            create_row: Function returning a new, unbound row dictionary
+            bind_row: Function (row, key) that shows the item for key
+            release_row: Function (row, key) called before a row is pooled
+            estimate_height: Function (key) returning an estimated row
+                height in pixels for rows that were never measured
+            pack_options: Keyword arguments used to pack each row frame
+            overscan: Extra pixels above and below the viewport to realize
+        """
+        self.container = scrollable_frame
+        self.canvas = scrollable_frame._parent_canvas
+        self._create_row = create_row
+        self._bind_row = bind_row
+        self._release_row = release_row
+        self._estimate_height = estimate_height
+        self._pack_options = pack_options or {"fill": "x"}
+        self._overscan = overscan
+
+        # Vertical pack padding is scaled by CustomTkinter, measure it in pixels
+        pady = self._pack_options.get("pady", 0)
+        pady_total = sum(pady) if isinstance(pady, (tuple, list)) else 2 * pady
+        try:
+            scaling = scrollable_frame._get_widget_scaling()
+        except Exception:
+            scaling = 1.0
+        self._row_padding = round(pady_total * scaling)
+
+        self.order = []  # Keys in display order
+        self.heights = {}  # Key -> measured height in pixels (with padding)
+        self.rows = {}  # Key -> realized row
+        self._pool = []
+        self._packed = []  # Keys currently packed, in order
+        self._refresh_pending = False
+        # Counts from the last reconciliation of packed rows
+        self.last_changes = {"inserted": 0, "removed": 0, "moved": 0}
+
+        self.top_spacer = tk.Frame(scrollable_frame, height=0, bd=0, highlightthickness=0)
+        self.bottom_spacer = tk.Frame(scrollable_frame, height=0, bd=0, highlightthickness=0)
+        self.top_spacer.pack(fill="x")
+        self.bottom_spacer.pack(fill="x")
+
+        # Route scrolling through the list so newly exposed rows get built.
+        # The scrollbar's set method is looked up per call so wrappers
+        # installed later (e.g. auto-hide) still run.
+        scrollbar = getattr(scrollable_frame, "_scrollbar", None)
+
+        def _on_yscroll(first, last):
+            if scrollbar is not None:
+                scrollbar.set(first, last)
+            self.schedule_refresh()
+
+        self.canvas.configure(yscrollcommand=_on_yscroll)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_refresh(), add="+")
+
+    def set_order(self, keys):
+        """Replace the displayed keys and refresh the realized rows.
+
+        Rows that stay visible are kept; see diff_order for how the packed
+        rows are reconciled with the new order.
+        """
+        keys = list(keys)
+        if keys == self.order:
+            return
+        self.order = keys
+        present = set(self.order)
+        for key in list(self.heights):
+            if key not in present:
+                del self.heights[key]
+        self.refresh()
+
+    def append(self, key):
+        """Add a key at the end of the list."""
+        self.order.append(key)
+        self.refresh()
+
+    def extend(self, keys):
+        """Add keys at the end of the list.
+
+        The realized rows are refreshed once the event loop is idle, so
+        adding many batches in one turn costs a single refresh.
+        """
+        self.order.extend(keys)
+        self.schedule_refresh()
+
+    def rename(self, old_key, new_key):
+        """Rebind the item stored under old_key to new_key in place."""
+        self.order = [new_key if key == old_key else key for key in self.order]
+        self._packed = [new_key if key == old_key else key for key in self._packed]
+        if old_key in self.heights:
+            self.heights[new_key] = self.heights.pop(old_key)
+        if old_key in self.rows:
+            row = self.rows.pop(old_key)
+            row["key"] = new_key
+            self.rows[new_key] = row
+
+    def invalidate_height(self, key):
+        """Forget a row's measured height (e.g. after collapsing it)."""
+        self.heights.pop(key, None)
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        """Refresh once the event loop is idle, coalescing repeated calls."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        try:
+            self.container.after_idle(self.refresh)
+        except Exception:
+            self._refresh_pending = False
+
+    def _height(self, key):
+        height = self.heights.get(key)
+        if height is None:
+            height = self._estimate_height(key)
+        return height
+
+    def _on_row_configure(self, row, height):
+        key = row.get("key")
+        if key is None:
+            return
+        height += self._row_padding
+        if self.heights.get(key) != height:
+            self.heights[key] = height
+            self.schedule_refresh()
+
+    def _visible_range(self):
+        """Return (top_height, visible_keys, bottom_height) for the viewport."""
+        try:
+            view_top = self.canvas.canvasy(0)
+            view_height = self.canvas.winfo_height()
+        except Exception:
+            view_top, view_height = 0, 0
+        # Before the first layout pass the canvas reports a height of 1
+        view_height = max(view_height, 1)
+        low = view_top - self._overscan
+        high = view_top + view_height + self._overscan
+
+        top_height = 0
+        visible_height = 0
+        visible = []
+        y = 0
+        for key in self.order:
+            height = self._height(key)
+            if y + height < low:
+                top_height += height
+            elif y <= high:
+                visible.append(key)
+                visible_height += height
+            y += height
+        return top_height, visible, y - top_height - visible_height
+
+    def refresh(self):
+        """Realize rows in the viewport, pool the rest and resize spacers."""
+        self._refresh_pending = False
+        top_height, visible, bottom_height = self._visible_range()
+        visible_set = set(visible)
+
+        for key in list(self.rows):
+            if key not in visible_set:
+                row = self.rows.pop(key)
+                row["frame"].pack_forget()
+                self._release_row(row, key)
+                row["key"] = None
+                self._pool.append(row)
+
+        for key in visible:
+            if key not in self.rows:
+                if self._pool:
+                    row = self._pool.pop()
+                else:
+                    row = self._create_row()
+                    row["frame"].bind(
+                        "<Configure>",
+                        lambda e, r=row: self._on_row_configure(r, e.height),
+                        add="+",
+                    )
+                row["key"] = key
+                self.rows[key] = row
+                self._bind_row(row, key)
+
+        self._sync_packing(visible)
+        self.top_spacer.configure(height=max(int(top_height), 0))
+        self.bottom_spacer.configure(height=max(int(bottom_height), 0))
+
+    def _sync_packing(self, visible):
+        """Pack realized rows between the spacers in display order.
+
+        Only rows that were inserted or moved are re-packed; rows whose
+        relative order is unchanged keep their place.
+        """
+        if visible == self._packed:
+            return
+        inserts, removes, moves = diff_order(self._packed, visible)
+        changed = set(inserts)
+        changed.update(moves)
+        previous = self.top_spacer
+        for key in visible:
+            frame = self.rows[key]["frame"]
+            if key in changed:
+                frame.pack(after=previous, **self._pack_options)
+            previous = frame
+        self._packed = list(visible)
+        self.last_changes = {
+            "inserted": len(inserts),
+            "removed": len(removes),
+            "moved": len(moves),
+        }
@@ -1,5 +1,5 @@
 """Utility functions module."""
 
-from .formatting import format_timedelta
+from .formatting import format_bytes, format_timedelta
 
-__all__ = ["format_timedelta"]
+__all__ = ["format_bytes", "format_timedelta"]
@@ -22,3 +22,21 @@ def format_timedelta(td: timedelta) -> str:
     if seconds or not parts:
         parts.append(f"{seconds}s")
     return " ".join(parts)
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count with a binary unit.
+
+    Examples:
+    - 512 B
+    - 3.4 KB
+    - 12.0 MB
+    """
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            break
+        value /= 1024
+    if unit == "B":
+        return f"{int(value)} B"
+    return f"{value:.1f} {unit}"